@@ -0,0 +1,179 @@
+"""
+Analítica vectorizada del historial de puntos
+Si NumPy está disponible (lo instala matplotlib), carga el historial de un
+perfil en columnas (fechas datetime64 y puntos int64) y calcula ganancias,
+gastos, resúmenes diarios y medias móviles con operaciones sobre arrays.
+Sin NumPy se usan los bucles de Python de siempre.
+"""
+
+import importlib.util
+
+from registros_perfil import RegistrosPerfil
+
+# NumPy se importa solo cuando se usa por primera vez (ver _importar_numpy)
+NUMPY_DISPONIBLE = importlib.util.find_spec('numpy') is not None
+np = None
+
+# Por debajo de este número de registros los bucles de Python son más rápidos
+MINIMO_VECTORIZAR = 500
+
+
+def _importar_numpy():
+    """Importa NumPy la primera vez que se necesita"""
+    global np
+
+    if np is None:
+        import numpy as np
+
+
+def usar_numpy(registros):
+    """Indica si conviene la ruta vectorizada para esta lista de registros"""
+    if NUMPY_DISPONIBLE and len(registros) >= MINIMO_VECTORIZAR:
+        _importar_numpy()
+        return True
+    return False
+
+
+def columnas(registros):
+    """
+    Convierte una lista de registros en columnas de NumPy
+
+    Args:
+        registros: Lista de dicts o RegistrosPerfil (cuyas columnas se usan tal cual)
+
+    Returns:
+        tuple (horas datetime64[s], fechas datetime64[D], puntos int64)
+    """
+    _importar_numpy()
+    if isinstance(registros, RegistrosPerfil):
+        # Copias: una vista sobre el array impediría seguir añadiéndole registros
+        horas = np.frombuffer(registros.horas, dtype=np.int64).astype('datetime64[s]')
+        puntos = np.frombuffer(registros.puntos, dtype=np.int64).copy()
+        return horas, horas.astype('datetime64[D]'), puntos
+
+    horas = np.array([r['hora'] for r in registros], dtype='datetime64[s]')
+    puntos = np.array([r['puntos'] for r in registros], dtype=np.int64)
+    return horas, horas.astype('datetime64[D]'), puntos
+
+
+def cantidades(registros):
+    """Número de registros originales que representa cada uno (ver 'agrupados')"""
+    if isinstance(registros, RegistrosPerfil):
+        resultado = np.ones(len(registros), dtype=np.int64)
+        for indice, cantidad in registros.agrupados.items():
+            resultado[indice] = cantidad
+        return resultado
+    return np.array([r.get('agrupados', 1) for r in registros], dtype=np.int64)
+
+
+def _agrupar_por_dia(fechas):
+    """Devuelve (días únicos, índice de día de cada registro)"""
+    return np.unique(fechas, return_inverse=True)
+
+
+def flujos_por_dia(registros, umbral_gasto):
+    """
+    Calcula ganancias y gastos por día y por mes de registros ordenados por hora.
+    Cada diferencia entre registros consecutivos cuenta para el día del segundo.
+
+    Returns:
+        tuple (por_dia, por_mes, gasto_total) donde
+        por_dia = {fecha: [ganancia, gasto, registros, puntos del primer registro]}
+        por_mes = {'YYYY-MM': [ganancia, gasto]}
+    """
+    _, fechas, puntos = columnas(registros)
+    dias, indice = _agrupar_por_dia(fechas)
+
+    diff = np.diff(puntos)
+    ganancias = np.where(diff > 0, diff, 0)
+    gastos = np.where(diff < -umbral_gasto, -diff, 0)
+
+    n_dias = len(dias)
+    ganancia_dia = np.bincount(indice[1:], weights=ganancias, minlength=n_dias).astype(np.int64)
+    gasto_dia = np.bincount(indice[1:], weights=gastos, minlength=n_dias).astype(np.int64)
+    registros_dia = np.bincount(indice, weights=cantidades(registros), minlength=n_dias).astype(np.int64)
+    # Los registros están ordenados, así que cada día empieza donde cambia el índice
+    primeros = puntos[np.searchsorted(indice, np.arange(n_dias))]
+
+    meses, indice_mes = np.unique(dias.astype('datetime64[M]'), return_inverse=True)
+    ganancia_mes = np.bincount(indice_mes, weights=ganancia_dia, minlength=len(meses)).astype(np.int64)
+    gasto_mes = np.bincount(indice_mes, weights=gasto_dia, minlength=len(meses)).astype(np.int64)
+
+    por_dia = {
+        fecha: [g, s, n, p]
+        for fecha, g, s, n, p in zip(
+            dias.astype(str).tolist(), ganancia_dia.tolist(), gasto_dia.tolist(),
+            registros_dia.tolist(), primeros.tolist()
+        )
+    }
+    por_mes = {
+        mes: [g, s]
+        for mes, g, s in zip(meses.astype(str).tolist(), ganancia_mes.tolist(), gasto_mes.tolist())
+    }
+    return por_dia, por_mes, int(gastos.sum())
+
+
+def resumen_por_dia(registros):
+    """
+    Resume los registros de un perfil por día (en el orden en que se escribieron)
+
+    Returns:
+        list [(fecha, ultimo, minimo, maximo, registros), ...] ordenada por fecha
+    """
+    if not usar_numpy(registros):
+        por_dia = {}
+        for r in registros:
+            dia = por_dia.get(r['fecha'])
+            if dia is None:
+                por_dia[r['fecha']] = [r['puntos'], r['puntos'], r['puntos'], r.get('agrupados', 1)]
+            else:
+                dia[0] = r['puntos']
+                dia[1] = min(dia[1], r['puntos'])
+                dia[2] = max(dia[2], r['puntos'])
+                dia[3] += r.get('agrupados', 1)
+        return [(fecha, *por_dia[fecha]) for fecha in sorted(por_dia)]
+
+    fechas = np.array([r['fecha'] for r in registros], dtype='datetime64[D]')
+    puntos = np.array([r['puntos'] for r in registros], dtype=np.int64)
+    dias, indice = _agrupar_por_dia(fechas)
+    registros_dia = np.bincount(indice, weights=cantidades(registros), minlength=len(dias))
+
+    # Agrupar los registros de cada día sin perder el orden de escritura
+    orden = np.argsort(indice, kind='stable')
+    puntos = puntos[orden]
+    inicio = np.searchsorted(indice[orden], np.arange(len(dias)))
+    fin = np.append(inicio[1:], len(puntos))
+
+    return list(zip(
+        dias.astype(str).tolist(),
+        puntos[fin - 1].tolist(),
+        np.minimum.reduceat(puntos, inicio).tolist(),
+        np.maximum.reduceat(puntos, inicio).tolist(),
+        registros_dia.astype(np.int64).tolist()
+    ))
+
+
+def media_movil(valores, ventana=7):
+    """
+    Media móvil de una serie. Los primeros valores usan una ventana parcial
+    para que el resultado tenga la misma longitud que la entrada.
+    """
+    if not valores:
+        return []
+
+    if not NUMPY_DISPONIBLE:
+        medias = []
+        suma = 0
+        for i, v in enumerate(valores):
+            suma += v
+            if i >= ventana:
+                suma -= valores[i - ventana]
+            medias.append(suma / min(i + 1, ventana))
+        return medias
+
+    _importar_numpy()
+    acumulado = np.cumsum(np.asarray(valores, dtype=np.float64))
+    sumas = acumulado.copy()
+    sumas[ventana:] = acumulado[ventana:] - acumulado[:-ventana]
+    divisores = np.minimum(np.arange(1, len(valores) + 1), ventana)
+    return (sumas / divisores).tolist()
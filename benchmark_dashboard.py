@@ -0,0 +1,296 @@
+"""
+Benchmark de las funciones de análisis del dashboard de puntos
+Genera historiales sintéticos (en el formato actual, JSON Lines) de distintos
+tamaños y números de perfiles, mide la latencia y el pico de memoria de
+cargar_historial, registrar_puntos, obtener_estadisticas, obtener_datos_grafica
+y obtener_ganancia_diaria, y guarda o compara los resultados con una base JSON.
+
+Uso:
+  python benchmark_dashboard.py                              # tabla de resultados
+  python benchmark_dashboard.py --guardar base.json          # guardar como base
+  python benchmark_dashboard.py --comparar base.json         # comparar con la base
+  python benchmark_dashboard.py --registros 10 1000 --perfiles 1 5
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Los módulos del proyecto usan rutas relativas: se importan desde aquí y se
+# ejecutan dentro de un directorio temporal
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import historial_cache
+import historial_store
+import puntos_dashboard
+import resumen_diario
+
+REGISTROS_POR_DEFECTO = [10, 1_000, 100_000, 1_000_000]
+PERFILES_POR_DEFECTO = [1, 10, 50]
+REPETICIONES = 5
+
+# Un historial sintético cubre como mucho este periodo (hasta hoy)
+DIAS_HISTORIAL = 730
+
+# Diferencia (en %) a partir de la cual una medida se considera una regresión
+UMBRAL_REGRESION = 20
+
+# Diferencias menores que estas se consideran ruido de medida
+MINIMO_DIFERENCIA_MS = 1.0
+MINIMO_DIFERENCIA_KB = 64
+
+
+def generar_historial(total_registros, num_perfiles, semilla=0):
+    """
+    Genera un historial sintético en el formato anidado de siempre
+
+    Args:
+        total_registros: Registros en total, repartidos entre los perfiles
+        num_perfiles: Número de perfiles
+        semilla: Semilla del generador aleatorio
+
+    Returns:
+        dict {perfil: {'email': str, 'registros': [dict, ...]}}
+    """
+    rnd = random.Random(semilla)
+    ahora = datetime.now()
+    historial = {}
+
+    for p in range(num_perfiles):
+        n = total_registros // num_perfiles + (1 if p < total_registros % num_perfiles else 0)
+        if n == 0:
+            continue
+
+        # Lecturas repartidas uniformemente (mínimo una por minuto) hasta ahora
+        intervalo = max(60, DIAS_HISTORIAL * 86400 // n)
+        hora = ahora - timedelta(seconds=intervalo * n)
+        puntos = rnd.randint(100, 5000)
+        registros = []
+        for _ in range(n):
+            hora += timedelta(seconds=intervalo)
+            azar = rnd.random()
+            if azar < 0.02:
+                # Canje
+                puntos = max(0, puntos - rnd.randint(100, 3000))
+            elif azar < 0.10:
+                # Fluctuación de la página
+                puntos = max(0, puntos - rnd.randint(1, 30))
+            else:
+                puntos += rnd.randint(0, 30)
+            registros.append({
+                'fecha': hora.strftime('%Y-%m-%d'),
+                'hora': hora.strftime('%Y-%m-%d %H:%M:%S'),
+                'puntos': puntos
+            })
+
+        historial[f'Profile {p + 1}'] = {'email': f'perfil{p + 1}@ejemplo.com', 'registros': registros}
+
+    return historial
+
+
+def _borrar_resumen():
+    """Elimina la base de datos del resumen diario para forzar su reconstrucción"""
+    for sufijo in ('', '-wal', '-shm'):
+        if os.path.exists(resumen_diario.RESUMEN_DB + sufijo):
+            os.remove(resumen_diario.RESUMEN_DB + sufijo)
+
+
+def medir(funcion, preparar=None, repeticiones=REPETICIONES):
+    """
+    Mide una función: mediana de la latencia y pico de memoria
+
+    Args:
+        funcion: Función sin argumentos a medir
+        preparar: Función que se ejecuta antes de cada medida (no se cronometra)
+        repeticiones: Número de ejecuciones cronometradas
+
+    Returns:
+        dict {'mediana_ms', 'min_ms', 'pico_kb'}
+    """
+    tiempos = []
+    for _ in range(repeticiones):
+        if preparar:
+            preparar()
+        # Que una recolección pendiente de medidas anteriores no caiga en esta
+        gc.collect()
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+
+    # La memoria se mide aparte porque tracemalloc ralentiza la ejecución
+    if preparar:
+        preparar()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcion()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'mediana_ms': round(statistics.median(tiempos), 3),
+        'min_ms': round(min(tiempos), 3),
+        'pico_kb': round(pico / 1024, 1)
+    }
+
+
+def ejecutar_escenario(total_registros, num_perfiles, repeticiones=REPETICIONES):
+    """
+    Mide todas las funciones con un historial sintético en un directorio temporal
+
+    Returns:
+        dict {nombre de la medida: resultado de medir()}
+    """
+    historial = generar_historial(total_registros, num_perfiles)
+    perfiles = list(historial)
+    siguiente = itertools.count()
+
+    def perfil():
+        # Ir rotando de perfil para no medir siempre el mismo
+        return perfiles[next(siguiente) % len(perfiles)]
+
+    directorio_original = os.getcwd()
+    directorio = tempfile.mkdtemp(prefix='benchmark_puntos_')
+    os.chdir(directorio)
+    try:
+        historial_store.escribir_historial(historial)
+        del historial
+        historial_cache.invalidar()
+
+        medidas = [
+            ('cargar_historial', puntos_dashboard.cargar_historial, None),
+            ('cargar_perfil (último registro)',
+             lambda: puntos_dashboard.cargar_perfil(perfil(), ultimos=1), None),
+            ('cargar_ultimos_registros', puntos_dashboard.cargar_ultimos_registros, None),
+            ('obtener_estadisticas (en frío)',
+             lambda: puntos_dashboard.obtener_estadisticas(perfil()), historial_cache.invalidar),
+            ('obtener_estadisticas',
+             lambda: puntos_dashboard.obtener_estadisticas(perfil()), None),
+            ('obtener_estadisticas_todos', puntos_dashboard.obtener_estadisticas_todos, None),
+            ('obtener_datos_grafica (en frío)',
+             lambda: puntos_dashboard.obtener_datos_grafica(perfil()), _borrar_resumen),
+            ('obtener_datos_grafica',
+             lambda: puntos_dashboard.obtener_datos_grafica(perfil()), None),
+            ('obtener_ganancia_diaria',
+             lambda: puntos_dashboard.obtener_ganancia_diaria(perfil()), None),
+            # Al final, porque añade registros al historial
+            ('registrar_puntos',
+             lambda: puntos_dashboard.registrar_puntos(perfil(), 'benchmark@ejemplo.com', '123456'), None),
+        ]
+
+        resultados = {}
+        for nombre, funcion, preparar in medidas:
+            resultados[nombre] = medir(funcion, preparar, repeticiones)
+        return resultados
+    finally:
+        os.chdir(directorio_original)
+        historial_cache.invalidar()
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def _clave(nombre, total_registros, num_perfiles):
+    return f"{nombre}|{total_registros}|{num_perfiles}"
+
+
+def comparar(resultados, base, umbral=UMBRAL_REGRESION):
+    """
+    Compara unos resultados con una base guardada. La latencia se compara por
+    el mejor tiempo (min_ms), que es la medida menos sensible al ruido.
+
+    Returns:
+        list con las claves que empeoran más de un umbral% en latencia o memoria
+    """
+    regresiones = []
+    print(f"\n{'Medida':<60} {'Base ms':>10} {'Ahora ms':>10} {'Δ ms':>8} {'Δ memoria':>10}")
+    for clave, actual in resultados.items():
+        anterior = base.get(clave)
+        if anterior is None:
+            continue
+
+        delta_ms = _variacion(anterior['min_ms'], actual['min_ms'])
+        delta_kb = _variacion(anterior['pico_kb'], actual['pico_kb'])
+        peor_ms = delta_ms > umbral and actual['min_ms'] - anterior['min_ms'] > MINIMO_DIFERENCIA_MS
+        peor_kb = delta_kb > umbral and actual['pico_kb'] - anterior['pico_kb'] > MINIMO_DIFERENCIA_KB
+        marca = ''
+        if peor_ms or peor_kb:
+            marca = ' ⚠️'
+            regresiones.append(clave)
+
+        print(f"{clave:<60} {anterior['min_ms']:>10.2f} {actual['min_ms']:>10.2f} "
+              f"{delta_ms:>+7.0f}% {delta_kb:>+9.0f}%{marca}")
+
+    return regresiones
+
+
+def _variacion(anterior, actual):
+    """Variación porcentual entre dos medidas"""
+    if not anterior:
+        return 0
+    return (actual - anterior) / anterior * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del dashboard de puntos")
+    parser.add_argument('--registros', type=int, nargs='+', default=REGISTROS_POR_DEFECTO,
+                        help="tamaños de historial (registros en total)")
+    parser.add_argument('--perfiles', type=int, nargs='+', default=PERFILES_POR_DEFECTO,
+                        help="números de perfiles")
+    parser.add_argument('--repeticiones', type=int, default=REPETICIONES,
+                        help="ejecuciones cronometradas por medida")
+    parser.add_argument('--guardar', metavar='ARCHIVO', help="guardar los resultados como base JSON")
+    parser.add_argument('--comparar', metavar='ARCHIVO', help="comparar con una base JSON guardada")
+    parser.add_argument('--umbral', type=float, default=UMBRAL_REGRESION,
+                        help="%% de empeoramiento que se considera regresión")
+    args = parser.parse_args()
+
+    resultados = {}
+    for total_registros in args.registros:
+        for num_perfiles in args.perfiles:
+            if num_perfiles > total_registros:
+                continue
+
+            print(f"\n📊 {total_registros:,} registros, {num_perfiles} perfiles")
+            for nombre, resultado in ejecutar_escenario(
+                total_registros, num_perfiles, args.repeticiones
+            ).items():
+                resultados[_clave(nombre, total_registros, num_perfiles)] = resultado
+                print(f"   • {nombre:<34} {resultado['mediana_ms']:>10.2f} ms  "
+                      f"{resultado['pico_kb']:>12,.1f} KB")
+
+    if args.guardar:
+        with open(args.guardar, 'w', encoding='utf-8') as f:
+            json.dump({
+                'fecha': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'python': platform.python_version(),
+                'plataforma': platform.platform(),
+                'resultados': resultados
+            }, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Base guardada en {args.guardar}")
+
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+        print(f"\n🔍 Comparando con {args.comparar} ({base.get('fecha', '?')})")
+        regresiones = comparar(resultados, base.get('resultados', {}), args.umbral)
+        if regresiones:
+            print(f"\n⚠️ {len(regresiones)} medidas empeoran más de un {args.umbral:.0f}%")
+            return 1
+        print("\n✅ Sin regresiones")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Compactación del historial de puntos
+El historial crece con cada lectura de puntos de cada perfil. Los días antiguos
+se reducen a sus registros primero, último, mínimo y máximo (más los dos
+extremos de cada gasto), y los días recientes y el mes en curso se conservan
+completos. Cada registro que queda guarda en 'agrupados' cuántos originales
+representa, así que las estadísticas y las gráficas del dashboard no cambian.
+"""
+
+import os
+import shutil
+import time
+from datetime import datetime, timedelta
+
+import historial_cache
+import historial_store
+import resumen_diario
+from estadisticas_puntos import UMBRAL_GASTO_MINIMO
+
+# Días recientes que se conservan siempre con todos sus registros
+DIAS_RESOLUCION_COMPLETA = 30
+
+# Copia del historial anterior a la última compactación
+HISTORIAL_RESPALDO = historial_store.HISTORIAL_JSONL + '.bak'
+
+
+def _gasto(puntos):
+    """Suma de los gastos (bajadas mayores que el umbral) de una serie de puntos"""
+    return sum(
+        anterior - actual
+        for anterior, actual in zip(puntos, puntos[1:])
+        if actual - anterior < -UMBRAL_GASTO_MINIMO
+    )
+
+
+def compactar_dia(registros):
+    """
+    Reduce los registros de un día a los imprescindibles
+
+    Args:
+        registros: Registros de un mismo día en orden de escritura
+
+    Returns:
+        list con los registros que se conservan; si quitar registros cambiara
+        el gasto del día se devuelven todos
+    """
+    n = len(registros)
+    if n <= 4:
+        return registros
+
+    puntos = [r['puntos'] for r in registros]
+    conservar = {0, n - 1, puntos.index(min(puntos)), puntos.index(max(puntos))}
+    # Los gastos se calculan entre registros consecutivos: conservar ambos extremos
+    for i in range(1, n):
+        if puntos[i] - puntos[i-1] < -UMBRAL_GASTO_MINIMO:
+            conservar.update((i - 1, i))
+
+    if len(conservar) == n:
+        return registros
+
+    # Varias bajadas pequeñas seguidas pueden sumar un gasto que no existía
+    if _gasto([puntos[i] for i in sorted(conservar)]) != _gasto(puntos):
+        return registros
+
+    compactados = []
+    pendientes = 0
+    for i, registro in enumerate(registros):
+        pendientes += registro.get('agrupados', 1)
+        if i in conservar:
+            nuevo = {'fecha': registro['fecha'], 'hora': registro['hora'], 'puntos': registro['puntos']}
+            if pendientes > 1:
+                nuevo['agrupados'] = pendientes
+            compactados.append(nuevo)
+            pendientes = 0
+
+    return compactados
+
+
+def compactar_registros(registros, fecha_limite):
+    """
+    Compacta los días anteriores a fecha_limite ('YYYY-MM-DD') de un perfil
+
+    Returns:
+        list con los registros resultantes, en el mismo orden
+    """
+    resultado = []
+    dia = []
+    for registro in registros:
+        if dia and registro['fecha'] != dia[0]['fecha']:
+            resultado.extend(compactar_dia(dia) if dia[0]['fecha'] < fecha_limite else dia)
+            dia = []
+        dia.append(registro)
+
+    if dia:
+        resultado.extend(compactar_dia(dia) if dia[0]['fecha'] < fecha_limite else dia)
+    return resultado
+
+
+def _fecha_limite(dias, ahora=None):
+    """Primer día que se conserva completo: el más antiguo entre hace N días y el día 1 del mes"""
+    ahora = ahora or datetime.now()
+    limite = (ahora - timedelta(days=dias)).strftime('%Y-%m-%d')
+    return min(limite, ahora.strftime('%Y-%m-01'))
+
+
+def _medir_carga(repeticiones=3):
+    """Segundos que tarda la carga completa del historial (mejor de varias)"""
+    mejor = None
+    for _ in range(repeticiones):
+        historial_cache.invalidar()
+        inicio = time.perf_counter()
+        historial_cache.obtener_historial()
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor
+
+
+def compactar_historial(dias=DIAS_RESOLUCION_COMPLETA, respaldo=True):
+    """
+    Compacta el historial de todos los perfiles
+
+    Args:
+        dias: Días recientes que se conservan completos (el mes en curso siempre)
+        respaldo: Si True, guarda una copia del historial anterior en HISTORIAL_RESPALDO
+
+    Returns:
+        dict con registros y bytes antes/después, tiempos de carga antes/después
+        y el tiempo de reconstruir el resumen diario
+    """
+    historial_store.migrar_historial_legado()
+    if not os.path.exists(historial_store.HISTORIAL_JSONL):
+        return None
+
+    fecha_limite = _fecha_limite(dias)
+    informe = {
+        'fecha_limite': fecha_limite,
+        'bytes_antes': os.path.getsize(historial_store.HISTORIAL_JSONL),
+        'carga_antes': _medir_carga(),
+        'registros_antes': 0,
+        'registros_despues': 0
+    }
+
+    if respaldo:
+        shutil.copy2(historial_store.HISTORIAL_JSONL, HISTORIAL_RESPALDO)
+
+    def transformar(historial):
+        for datos in historial.values():
+            informe['registros_antes'] += len(datos['registros'])
+            datos['registros'] = compactar_registros(datos['registros'], fecha_limite)
+            informe['registros_despues'] += len(datos['registros'])
+        return historial
+
+    historial_store.reescribir_historial(transformar)
+
+    # El archivo reescrito es nuevo (otro inodo): reconstruir ya el resumen diario
+    # para que no le toque al primero que lo consulte (p. ej. la GUI al arrancar)
+    inicio = time.perf_counter()
+    resumen_diario.sincronizar()
+    informe['resumen'] = time.perf_counter() - inicio
+
+    informe['bytes_despues'] = os.path.getsize(historial_store.HISTORIAL_JSONL)
+    informe['carga_despues'] = _medir_carga()
+    return informe
+
+
+def imprimir_informe(informe):
+    """Muestra por consola el resultado de compactar_historial"""
+    if informe is None:
+        print("No hay historial que compactar")
+        return
+
+    liberados = informe['bytes_antes'] - informe['bytes_despues']
+    mejora = informe['carga_antes'] / informe['carga_despues'] if informe['carga_despues'] else 0
+
+    print(f"🗜️ Historial compactado (días anteriores a {informe['fecha_limite']})")
+    print(f"   • Registros: {informe['registros_antes']:,} → {informe['registros_despues']:,}")
+    print(f"   • Tamaño: {informe['bytes_antes']:,} → {informe['bytes_despues']:,} bytes "
+          f"({liberados:,} bytes liberados)")
+    print(f"   • Carga: {informe['carga_antes'] * 1000:.1f} ms → "
+          f"{informe['carga_despues'] * 1000:.1f} ms (x{mejora:.1f})")
+    print(f"   • Resumen diario reconstruido en {informe['resumen'] * 1000:.1f} ms")
@@ -13,15 +13,36 @@ import threading
 import os
 import shutil
 import tempfile
-from selenium import webdriver
-from selenium.webdriver.edge.service import Service
-from selenium.webdriver.edge.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
-from faker import Faker
+
+# Selenium, webdriver_manager y Faker tardan en importarse: se cargan la primera
+# vez que se necesitan (ver _cargar_dependencias) para que la GUI arranque rápido
+webdriver = Service = Options = By = Keys = WebDriverWait = EC = None
+EdgeChromiumDriverManager = Faker = None
+_dependencias_cargadas = False
+_dependencias_lock = threading.Lock()
+
+
+def _cargar_dependencias():
+    """Importa las librerías de automatización si aún no se han importado"""
+    global webdriver, Service, Options, By, Keys, WebDriverWait, EC
+    global EdgeChromiumDriverManager, Faker, _dependencias_cargadas
+    
+    if _dependencias_cargadas:
+        return
+    
+    with _dependencias_lock:
+        if _dependencias_cargadas:
+            return
+        from selenium import webdriver
+        from selenium.webdriver.edge.service import Service
+        from selenium.webdriver.edge.options import Options
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.common.keys import Keys
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from webdriver_manager.microsoft import EdgeChromiumDriverManager
+        from faker import Faker
+        _dependencias_cargadas = True
 
 # ============================================================================
 # CONFIGURACIÓN PRINCIPAL
@@ -74,6 +95,7 @@ def generar_busquedas_realistas(cantidad):
     Returns:
         list: Lista de frases de búsqueda
     """
+    _cargar_dependencias()
     fake = Faker('es_ES')  # Usar español de España
     busquedas = []
     
@@ -163,6 +185,7 @@ def crear_driver_edge(nombre_perfil, headless=False, puerto_debug=None):
     Returns:
         webdriver: Instancia configurada del WebDriver
     """
+    _cargar_dependencias()
     opciones = Options()
     
     # Configurar directorio base de User Data
@@ -226,6 +249,7 @@ def crear_driver_edge_temp(temp_user_data, nombre_perfil, headless=False, puerto
     Returns:
         webdriver: Instancia configurada del WebDriver
     """
+    _cargar_dependencias()
     opciones = Options()
     
     # Usar el directorio temporal como User Data
@@ -285,6 +309,7 @@ def realizar_busqueda(driver, texto_busqueda):
     Returns:
         bool: True si la búsqueda fue exitosa, False en caso contrario
     """
+    _cargar_dependencias()
     try:
         # Verificar si el driver aún está activo
         try:
@@ -338,6 +363,7 @@ def obtener_puntos_recompensa(driver, timeout=2):
     Returns:
         str: Puntos encontrados o None
     """
+    _cargar_dependencias()
     try:
         # Método 1: ID directo 'id_rc' (el más común en Bing)
         try:
@@ -2,13 +2,23 @@
 Interfaz Gráfica para Automatización de Búsquedas en Microsoft Edge
 Autor: Asistente de IA
 Fecha: Febrero 2026
+
+Uso: python edge_search_gui.py [--profile-startup] [--perfilar]
+  --profile-startup  Muestra cuánto tarda el arranque y qué librerías pesadas
+                     se cargaron (para un detalle por módulo: python -X importtime)
+  --perfilar         Mide cada paso del arranque y del dashboard (ver instrumentacion)
 """
 
+import time
+_INICIO_IMPORTS = time.perf_counter()
+
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 import threading
+import queue
 import json
 import os
+import sys
 from datetime import datetime
 from edge_search_automation import (
     USER_DATA_DIR, 
@@ -18,21 +28,66 @@ from edge_search_automation import (
     procesar_perfil,
     generar_busquedas_realistas
 )
-from puntos_dashboard import registrar_puntos, abrir_dashboard
+from puntos_dashboard import registrar_puntos, abrir_dashboard, cargar_perfil
+import instrumentacion
+import preferencias_cache
+import progreso_store
+
+_FIN_IMPORTS = time.perf_counter()
 
-# Archivo para guardar el progreso
-PROGRESO_FILE = "progreso_busquedas.json"
 CONFIG_FILE = "config_perfiles.json"
 
+# Registro de actividad: cada cuánto se vuelcan los mensajes y cuántas líneas se conservan
+LOG_INTERVALO_MS = 100
+LOG_MAX_LINEAS = 1000
+
+# Cada cuánto se aplican en la UI las actualizaciones pendientes de las tarjetas
+BUS_INTERVALO_MS = 100
+
+
+class BusActualizaciones:
+    """
+    Recibe desde cualquier hilo las actualizaciones de las tarjetas de perfil y
+    las aplica todas juntas en una pasada periódica de la UI. Para cada
+    (tarjeta, campo) solo se conserva la última actualización pendiente.
+    """
+    
+    def __init__(self, root, intervalo_ms=BUS_INTERVALO_MS):
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        self._lock = threading.Lock()
+        self._pendientes = {}
+        self._aplicar()
+    
+    def publicar(self, card, campo, funcion, *args):
+        """Programa funcion(*args) para la próxima pasada, reemplazando la anterior del mismo campo"""
+        with self._lock:
+            self._pendientes[(card, campo)] = (funcion, args)
+    
+    def _aplicar(self):
+        """Aplica todas las actualizaciones pendientes y se vuelve a programar"""
+        with self._lock:
+            pendientes, self._pendientes = self._pendientes, {}
+        
+        for (card, campo), (funcion, args) in pendientes.items():
+            try:
+                funcion(*args)
+            except Exception as e:
+                print(f"Error al actualizar {campo} de {card.nombre_perfil}: {e}")
+        
+        self.root.after(self.intervalo_ms, self._aplicar)
+
 
 class PerfilCard(tk.Frame):
     """Widget que representa una tarjeta de perfil"""
     
-    def __init__(self, parent, nombre_perfil, numero, callback=None):
+    def __init__(self, parent, nombre_perfil, numero, bus, callback=None):
         super().__init__(parent, relief=tk.RAISED, borderwidth=2, bg='white')
         self.nombre_perfil = nombre_perfil
         self.numero = numero
         self.callback = callback
+        # Bus por el que los otros hilos actualizan los widgets de la tarjeta
+        self.bus = bus
         
         # Variable para checkbox
         self.selected = tk.BooleanVar(value=False)
@@ -41,6 +96,9 @@ class PerfilCard(tk.Frame):
         self.detener_individual = False
         self.ejecutando_ahora = False
         
+        # Email del perfil (None hasta que se lee del Preferences)
+        self.email = None
+        
         # Variables de progreso
         self.busquedas_completadas = tk.IntVar(value=0)
         self.estado = tk.StringVar(value="Pendiente")
@@ -181,139 +239,118 @@ class PerfilCard(tk.Frame):
     
     def _cargar_datos(self):
         """Carga datos guardados del perfil"""
-        # Intentar cargar email desde Preferences
+        # Intentar cargar email desde Preferences (caché o, si cambió, en segundo plano)
         try:
             prefs_path = os.path.join(USER_DATA_DIR, self.nombre_perfil, 'Preferences')
             if os.path.exists(prefs_path):
-                with open(prefs_path, 'r', encoding='utf-8') as f:
-                    prefs = json.load(f)
-                    # Intentar obtener email de diferentes ubicaciones
-                    email = None
-                    if 'account_info' in prefs:
-                        for account in prefs['account_info']:
-                            if 'email' in account:
-                                email = account['email']
-                                break
-                    
-                    if not email and 'profile' in prefs:
-                        email = prefs['profile'].get('user_name', None)
-                    
-                    if email:
-                        self.email_label.config(text=f"📧 {email}")
-                    else:
-                        self.email_label.config(text="📧 No disponible")
+                encontrado, email = preferencias_cache.consultar(prefs_path)
+                if encontrado:
+                    self._mostrar_email(email)
+                else:
+                    preferencias_cache.cargar_en_segundo_plano(prefs_path, self._email_cargado)
             else:
                 self.email_label.config(text="📧 Perfil no encontrado")
         except Exception as e:
-            self.email_label.config(text="📧 Error al cargar")
+            self._mostrar_error_email()
         
-        # Cargar puntos guardados del historial
-        self._cargar_puntos_historial()
+        # Los puntos guardados se cargan en segundo plano (ver EdgeSearchGUI._cargar_puntos_tarjetas)
         
         # Cargar progreso guardado
         self._cargar_progreso()
     
+    def _email_cargado(self, email, error):
+        """
+        Recibe (desde el hilo de lectura) el email del Preferences. Este hilo no
+        llama a Tk (puede que mainloop aún no haya empezado): la etiqueta se
+        actualiza en la siguiente pasada del bus, desde el hilo de la UI.
+        """
+        if error:
+            self.bus.publicar(self, 'email', self._mostrar_error_email)
+        else:
+            self.email = email or None
+            self.bus.publicar(self, 'email', self._mostrar_email, email)
+    
+    def _mostrar_email(self, email):
+        """Muestra el email del perfil"""
+        self.email = email or None
+        if email:
+            self.email_label.config(text=f"📧 {email}")
+        else:
+            self.email_label.config(text="📧 No disponible")
+    
+    def _mostrar_error_email(self):
+        """Indica que no se pudo leer el email del perfil"""
+        self.email_label.config(text="📧 Error al cargar")
+    
     def _cargar_progreso(self):
-        """Carga el progreso guardado del archivo JSON"""
+        """Carga el progreso guardado"""
         try:
-            if os.path.exists(PROGRESO_FILE):
-                with open(PROGRESO_FILE, 'r') as f:
-                    data = json.load(f)
-                    
-                    if self.nombre_perfil in data:
-                        perfil_data = data[self.nombre_perfil]
-                        completadas = perfil_data.get('completadas', 0)
-                        ultima_fecha = perfil_data.get('fecha', '')
-                        
-                        # Verificar si es del día de hoy
-                        hoy = datetime.now().strftime('%Y-%m-%d')
-                        if ultima_fecha.startswith(hoy):
-                            # Es del mismo día, cargar progreso
-                            self.actualizar_progreso(completadas)
-                            if completadas >= BUSQUEDAS_POR_PERFIL:
-                                self.estado.set("✅ Completado hoy")
-                                self.estado_label.config(fg='green')
-                            else:
-                                self.estado.set(f"🔄 {completadas}/{BUSQUEDAS_POR_PERFIL} hoy")
-                                self.estado_label.config(fg='orange')
-                            self.update_label.config(text=f"Última actualización: {ultima_fecha}")
-                        else:
-                            # Es de un día anterior, resetear progreso
-                            self.actualizar_progreso(0)
-                            self.estado.set("🆕 Nuevo día - Listo para comenzar")
-                            self.estado_label.config(fg='blue')
-                            if ultima_fecha:
-                                self.update_label.config(text=f"Último uso: {ultima_fecha}")
-                            # Limpiar el registro antiguo
-                            self._resetear_progreso_archivo()
+            perfil_data = progreso_store.obtener(self.nombre_perfil)
+            
+            if perfil_data:
+                completadas = perfil_data.get('completadas', 0)
+                ultima_fecha = perfil_data.get('fecha', '')
+                
+                # Verificar si es del día de hoy
+                hoy = datetime.now().strftime('%Y-%m-%d')
+                if ultima_fecha.startswith(hoy):
+                    # Es del mismo día, cargar progreso
+                    self.actualizar_progreso(completadas)
+                    if completadas >= BUSQUEDAS_POR_PERFIL:
+                        self.estado.set("✅ Completado hoy")
+                        self.estado_label.config(fg='green')
+                    else:
+                        self.estado.set(f"🔄 {completadas}/{BUSQUEDAS_POR_PERFIL} hoy")
+                        self.estado_label.config(fg='orange')
+                    self.update_label.config(text=f"Última actualización: {ultima_fecha}")
+                else:
+                    # Es de un día anterior, resetear progreso
+                    self.actualizar_progreso(0)
+                    self.estado.set("🆕 Nuevo día - Listo para comenzar")
+                    self.estado_label.config(fg='blue')
+                    if ultima_fecha:
+                        self.update_label.config(text=f"Último uso: {ultima_fecha}")
+                    # Limpiar el registro antiguo
+                    self._resetear_progreso_archivo()
         except Exception as e:
             pass
     
     def _resetear_progreso_archivo(self):
-        """Resetea el progreso de este perfil en el archivo JSON"""
+        """Elimina el progreso guardado de este perfil"""
         try:
-            data = {}
-            if os.path.exists(PROGRESO_FILE):
-                with open(PROGRESO_FILE, 'r') as f:
-                    data = json.load(f)
-            
-            # Eliminar o resetear el perfil
-            if self.nombre_perfil in data:
-                del data[self.nombre_perfil]
-                
-                with open(PROGRESO_FILE, 'w') as f:
-                    json.dump(data, f, indent=2)
+            progreso_store.eliminar(self.nombre_perfil)
         except Exception as e:
             pass
     
     def _cargar_puntos_historial(self):
-        """Carga los últimos puntos guardados del historial"""
+        """
+        Carga los últimos puntos guardados del historial. Se llama desde un hilo
+        aparte (la primera lectura puede tener que reconstruir el índice), así
+        que la etiqueta se actualiza a través del bus.
+        """
         try:
-            historial_file = "historial_puntos.json"
-            if os.path.exists(historial_file):
-                with open(historial_file, 'r', encoding='utf-8') as f:
-                    historial = json.load(f)
-                    
-                    if self.nombre_perfil in historial:
-                        registros = historial[self.nombre_perfil].get('registros', [])
-                        if registros:
-                            # Obtener el último registro
-                            ultimo = registros[-1]
-                            puntos = ultimo.get('puntos', 0)
-                            if puntos:
-                                PUNTOS_PARA_CANJEAR = 6550
-                                if puntos >= PUNTOS_PARA_CANJEAR:
-                                    self.puntos_label.config(
-                                        text=f"🎁 ¡{puntos:,} LISTO!",
-                                        fg='#27ae60',
-                                        font=('Arial', 10, 'bold')
-                                    )
-                                else:
-                                    faltan = PUNTOS_PARA_CANJEAR - puntos
-                                    self.puntos_label.config(
-                                        text=f"💰 {puntos:,} (faltan {faltan:,})",
-                                        fg='#f39c12',
-                                        font=('Arial', 9)
-                                    )
+            # Solo se lee el último registro del perfil, no todo el historial
+            perfil = cargar_perfil(self.nombre_perfil, ultimos=1)
+            
+            if perfil is not None:
+                registros = perfil.get('registros', [])
+                if registros:
+                    # Obtener el último registro
+                    puntos = registros[-1].get('puntos', 0)
+                    if puntos:
+                        self.bus.publicar(self, 'puntos', self.set_puntos, puntos)
         except Exception as e:
             pass
     
     def _guardar_progreso(self):
-        """Guarda el progreso en el archivo JSON"""
+        """Guarda el progreso (se vuelca a disco por lotes)"""
         try:
-            data = {}
-            if os.path.exists(PROGRESO_FILE):
-                with open(PROGRESO_FILE, 'r') as f:
-                    data = json.load(f)
-            
-            data[self.nombre_perfil] = {
-                'completadas': self.busquedas_completadas.get(),
-                'fecha': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'numero': self.numero
-            }
-            
-            with open(PROGRESO_FILE, 'w') as f:
-                json.dump(data, f, indent=2)
+            progreso_store.guardar(
+                self.nombre_perfil,
+                completadas=self.busquedas_completadas.get(),
+                fecha=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                numero=self.numero
+            )
         except Exception as e:
             pass
     
@@ -378,10 +415,6 @@ class PerfilCard(tk.Frame):
                     )
             except:
                 self.puntos_label.config(text=f"💰 Puntos: {puntos}")
-            
-            # Guardar en el historial
-            email = self.email_label.cget('text').replace('📧 ', '')
-            registrar_puntos(self.nombre_perfil, email, puntos)
     
     def set_estado(self, texto, color='gray'):
         """Establece el estado del perfil"""
@@ -394,6 +427,7 @@ class EdgeSearchGUI:
     """Ventana principal de la aplicación"""
     
     def __init__(self):
+        accion = instrumentacion.iniciar("Iniciar GUI")
         self.root = tk.Tk()
         self.root.title("Edge Search Automation - Control Panel")
         self.root.geometry("900x700")
@@ -405,8 +439,25 @@ class EdgeSearchGUI:
         self.detener_flag = False
         self.threads_activos = []
         
+        # Cola de mensajes del log (los hilos encolan, la UI vuelca por lotes)
+        self._cola_log = queue.Queue()
+        
+        # Actualizaciones de las tarjetas enviadas desde otros hilos
+        self.bus = BusActualizaciones(self.root)
+        
         self._crear_ui()
-        self._cargar_perfiles()
+        accion.marcar("construir ventana")
+        self._cargar_perfiles(accion)
+        self._volcar_log()
+        
+        # La primera vez que Tk queda libre la ventana ya está dibujada
+        self.root.after_idle(lambda: self._fin_arranque(accion))
+    
+    def _fin_arranque(self, accion):
+        """Cierra la medida del arranque y abre el panel de tiempos (con --perfilar)"""
+        accion.marcar("primer dibujado")
+        accion.terminar()
+        instrumentacion.mostrar_panel(self.root)
     
     def _crear_ui(self):
         """Crea la interfaz principal"""
@@ -574,10 +625,11 @@ class EdgeSearchGUI:
         )
         self.log_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
     
-    def _cargar_perfiles(self):
+    def _cargar_perfiles(self, accion=instrumentacion.ACCION_INACTIVA):
         """Carga las tarjetas de perfiles"""
         # Limpiar progreso de días anteriores al inicio
         self._limpiar_progreso_antiguo()
+        accion.marcar("limpiar progreso antiguo")
         
         # Crear grid de 3 columnas
         for i, nombre_perfil in enumerate(PERFILES_EDGE):
@@ -588,48 +640,61 @@ class EdgeSearchGUI:
                 self.scrollable_frame,
                 nombre_perfil,
                 i + 1,
+                self.bus,
                 callback=self.actualizar_contador
             )
             card.grid(row=fila, column=columna, padx=10, pady=10, sticky='nsew')
             
             self.perfil_cards.append(card)
+            # Cada tarjeta lee su email y su progreso
+            accion.marcar(f"tarjeta {nombre_perfil}")
         
         # Configurar grid para que las columnas se expandan igual
         for col in range(3):
             self.scrollable_frame.grid_columnconfigure(col, weight=1, uniform="col")
         
+        threading.Thread(target=self._cargar_puntos_tarjetas, daemon=True).start()
+        
         fecha_hoy = datetime.now().strftime('%d/%m/%Y')
         self.log(f"Sistema iniciado - {fecha_hoy}. Listo para comenzar.")
     
+    def _cargar_puntos_tarjetas(self):
+        """Carga los puntos guardados de cada tarjeta fuera del hilo de la UI"""
+        for card in self.perfil_cards:
+            card._cargar_puntos_historial()
+    
     def _limpiar_progreso_antiguo(self):
         """Limpia el progreso de días anteriores"""
         try:
-            if os.path.exists(PROGRESO_FILE):
-                with open(PROGRESO_FILE, 'r') as f:
-                    data = json.load(f)
-                
-                hoy = datetime.now().strftime('%Y-%m-%d')
-                perfiles_actualizados = {}
-                
-                # Filtrar solo los perfiles del día de hoy
-                for perfil, info in data.items():
-                    fecha = info.get('fecha', '')
-                    if fecha.startswith(hoy):
-                        perfiles_actualizados[perfil] = info
-                
-                # Guardar solo los datos del día actual
-                if perfiles_actualizados != data:
-                    with open(PROGRESO_FILE, 'w') as f:
-                        json.dump(perfiles_actualizados, f, indent=2)
+            hoy = datetime.now().strftime('%Y-%m-%d')
+            progreso_store.conservar_solo_fecha(hoy)
         except Exception as e:
             pass
     
     def log(self, mensaje):
-        """Añade un mensaje al log"""
+        """Añade un mensaje al log (se puede llamar desde cualquier hilo)"""
         timestamp = datetime.now().strftime('%H:%M:%S')
-        self.log_text.insert(tk.END, f"[{timestamp}] {mensaje}\n")
-        self.log_text.see(tk.END)
-        self.root.update()
+        self._cola_log.put(f"[{timestamp}] {mensaje}\n")
+    
+    def _volcar_log(self):
+        """Vuelca al widget los mensajes pendientes en un solo insert y recorta las líneas antiguas"""
+        mensajes = []
+        try:
+            while True:
+                mensajes.append(self._cola_log.get_nowait())
+        except queue.Empty:
+            pass
+        
+        if mensajes:
+            self.log_text.insert(tk.END, ''.join(mensajes))
+            
+            lineas = int(self.log_text.index('end-1c').split('.')[0])
+            if lineas > LOG_MAX_LINEAS:
+                self.log_text.delete('1.0', f"{lineas - LOG_MAX_LINEAS + 1}.0")
+            
+            self.log_text.see(tk.END)
+        
+        self.root.after(LOG_INTERVALO_MS, self._volcar_log)
     
     def actualizar_contador(self):
         """Actualiza el contador de perfiles seleccionados"""
@@ -966,14 +1031,16 @@ class EdgeSearchGUI:
     def ejecutar_perfil(self, card):
         """Ejecuta las búsquedas para un perfil específico"""
         try:
-            card.iniciar_ejecucion()
+            # La señal de detención se resetea ya; los widgets se actualizan vía bus
+            card.detener_individual = False
+            self.bus.publicar(card, 'ejecucion', card.iniciar_ejecucion)
             self.log(f"🔍 Procesando {card.nombre_perfil}...")
             
             # Crear callback para actualizar progreso en tiempo real
             def actualizar_progreso(completadas):
-                # Usar after para actualizar desde el thread seguro
-                self.root.after(0, lambda: card.actualizar_progreso(completadas))
-                self.root.after(0, lambda: self.log(f"📊 {card.nombre_perfil}: {completadas}/{BUSQUEDAS_POR_PERFIL} búsquedas"))
+                # El bus aplica la actualización desde el hilo de la UI
+                self.bus.publicar(card, 'progreso', card.actualizar_progreso, completadas)
+                self.log(f"📊 {card.nombre_perfil}: {completadas}/{BUSQUEDAS_POR_PERFIL} búsquedas")
                 # No necesitamos retornar nada, detener_flag maneja la detención
                 return None
             
@@ -981,8 +1048,11 @@ class EdgeSearchGUI:
             def actualizar_info(info):
                 if info.get('tipo') == 'puntos':
                     puntos = info.get('valor')
-                    self.root.after(0, lambda: card.set_puntos(puntos))
-                    self.root.after(0, lambda: self.log(f"💰 {card.nombre_perfil}: {puntos} puntos"))
+                    # Cada lectura se guarda en el historial desde este hilo (el bus
+                    # solo conserva la última pendiente); a la UI solo va la etiqueta
+                    registrar_puntos(card.nombre_perfil, card.email, puntos)
+                    self.bus.publicar(card, 'puntos', card.set_puntos, puntos)
+                    self.log(f"💰 {card.nombre_perfil}: {puntos} puntos")
             
             # Función para verificar detención (global o individual)
             def verificar_detener():
@@ -1003,28 +1073,28 @@ class EdgeSearchGUI:
             
             # Verificar si se detuvo o se completó
             if self.detener_flag:
-                self.root.after(0, lambda: card.set_estado("⏹️ Detenido (global)", "orange"))
-                self.root.after(0, lambda: card.finalizar_ejecucion())
+                self.bus.publicar(card, 'estado', card.set_estado, "⏹️ Detenido (global)", "orange")
+                self.bus.publicar(card, 'ejecucion', card.finalizar_ejecucion)
                 self.log(f"⏹️ {card.nombre_perfil} detenido por usuario (completadas: {completadas}/{BUSQUEDAS_POR_PERFIL})")
             elif card.detener_individual:
-                self.root.after(0, lambda: card.set_estado("⏹️ Detenido", "orange"))
-                self.root.after(0, lambda: card.finalizar_ejecucion())
+                self.bus.publicar(card, 'estado', card.set_estado, "⏹️ Detenido", "orange")
+                self.bus.publicar(card, 'ejecucion', card.finalizar_ejecucion)
                 self.log(f"⏹️ {card.nombre_perfil} detenido individualmente (completadas: {completadas}/{BUSQUEDAS_POR_PERFIL})")
             elif completadas >= BUSQUEDAS_POR_PERFIL:
                 # Solo marcar como completado si realmente terminó todas
-                self.root.after(0, lambda: card.set_estado("✅ Completado", "green"))
-                self.root.after(0, lambda: card.finalizar_ejecucion())
+                self.bus.publicar(card, 'estado', card.set_estado, "✅ Completado", "green")
+                self.bus.publicar(card, 'ejecucion', card.finalizar_ejecucion)
                 self.log(f"✅ {card.nombre_perfil} completado exitosamente")
             else:
                 # Terminó con menos búsquedas (error o detención no capturada)
-                self.root.after(0, lambda: card.set_estado("⚠️ Incompleto", "orange"))
-                self.root.after(0, lambda: card.finalizar_ejecucion())
+                self.bus.publicar(card, 'estado', card.set_estado, "⚠️ Incompleto", "orange")
+                self.bus.publicar(card, 'ejecucion', card.finalizar_ejecucion)
                 self.log(f"⚠️ {card.nombre_perfil} terminó con {completadas}/{BUSQUEDAS_POR_PERFIL} búsquedas")
             
         except Exception as e:
             # Error inesperado durante la ejecución
-            self.root.after(0, lambda: card.set_estado(f"❌ Error: {str(e)[:30]}...", "red"))
-            self.root.after(0, lambda: card.finalizar_ejecucion())
+            self.bus.publicar(card, 'estado', card.set_estado, f"❌ Error: {str(e)[:30]}...", "red")
+            self.bus.publicar(card, 'ejecucion', card.finalizar_ejecucion)
             self.log(f"❌ Error en {card.nombre_perfil}: {str(e)}")
         
         finally:
@@ -1060,12 +1130,11 @@ class EdgeSearchGUI:
     
     def recargar_aplicacion(self):
         """Recarga la aplicación con la nueva configuración"""
-        # Destruir ventana actual
+        # Destruir ventana actual (os.execl no ejecuta atexit: guardar el progreso antes)
+        progreso_store.guardar_pendientes()
         self.root.destroy()
         
         # Crear nueva instancia
-        import sys
-        import os
         python = sys.executable
         os.execl(python, python, *sys.argv)
     
@@ -1074,6 +1143,24 @@ class EdgeSearchGUI:
         self.root.mainloop()
 
 
+# Librerías que no deberían importarse al arrancar (solo al usarlas)
+LIBRERIAS_PESADAS = ['selenium', 'webdriver_manager', 'faker', 'matplotlib', 'numpy']
+
+
+def informe_arranque(inicio_ventana, fin_ventana):
+    """Imprime los tiempos de arranque de la GUI y las librerías pesadas ya cargadas"""
+    cargadas = [lib for lib in LIBRERIAS_PESADAS if lib in sys.modules]
+    
+    print("\n⏱️ Tiempo de arranque:")
+    print(f"   • Imports: {(_FIN_IMPORTS - _INICIO_IMPORTS) * 1000:.0f} ms")
+    print(f"   • Construcción de la ventana: {(fin_ventana - inicio_ventana) * 1000:.0f} ms")
+    print(f"   • Total hasta mostrar la ventana: {(fin_ventana - _INICIO_IMPORTS) * 1000:.0f} ms")
+    if cargadas:
+        print(f"   ⚠️ Librerías pesadas cargadas al inicio: {', '.join(cargadas)}")
+    else:
+        print("   • Librerías pesadas cargadas al inicio: ninguna")
+
+
 if __name__ == "__main__":
     # Cargar configuración si existe
     if os.path.exists(CONFIG_FILE):
@@ -1090,5 +1177,14 @@ if __name__ == "__main__":
         except Exception as e:
             print(f"Error al cargar configuración: {e}")
     
+    if '--perfilar' in sys.argv:
+        instrumentacion.activar()
+    if instrumentacion.ACTIVO:
+        instrumentacion.registrar("Iniciar GUI", "imports", (_FIN_IMPORTS - _INICIO_IMPORTS) * 1000)
+    
+    inicio_ventana = time.perf_counter()
     app = EdgeSearchGUI()
+    if '--profile-startup' in sys.argv:
+        app.root.update_idletasks()
+        informe_arranque(inicio_ventana, time.perf_counter())
     app.run()
@@ -0,0 +1,153 @@
+"""
+Estadísticas incrementales de puntos por perfil
+Mantiene totales acumulados (hoy, mes, gastos, primer registro, ventana de
+7 días) que se actualizan a medida que se añaden registros, de modo que
+consultar las estadísticas no requiere recorrer el historial.
+"""
+
+from datetime import datetime, timedelta
+
+import analitica_puntos
+from registros_perfil import RegistrosPerfil
+
+# Umbral mínimo para considerar un gasto real (ignorar fluctuaciones de la página)
+# Los canjes mínimos en Rewards suelen ser de 100+ puntos
+UMBRAL_GASTO_MINIMO = 50
+
+
+class AgregadorPerfil:
+    """Acumula las estadísticas de un perfil registro a registro"""
+
+    def __init__(self, registros=None):
+        """
+        Args:
+            registros: Registros iniciales ya ordenados por hora, como lista de
+                dicts o RegistrosPerfil (opcional)
+        """
+        self.primero = None
+        self.ultimo = None
+        self.total_registros = 0
+        self.gasto_total = 0
+        # fecha -> [ganancia, gasto, registros, puntos del primer registro]
+        self.por_dia = {}
+        # 'YYYY-MM' -> [ganancia, gasto]
+        self.por_mes = {}
+        self._puntos_anteriores = None
+
+        if not registros:
+            return
+
+        if analitica_puntos.usar_numpy(registros):
+            # Historial grande: calcular todos los acumulados de una vez con NumPy
+            self.por_dia, self.por_mes, self.gasto_total = analitica_puntos.flujos_por_dia(
+                registros, UMBRAL_GASTO_MINIMO
+            )
+            self.primero = registros[0]
+            self.ultimo = registros[-1]
+            self.total_registros = sum(dia[2] for dia in self.por_dia.values())
+            self._puntos_anteriores = self.ultimo['puntos']
+            return
+
+        if isinstance(registros, RegistrosPerfil):
+            # Recorrer las columnas directamente, sin crear un dict por registro
+            for fecha, puntos, cantidad in registros.iterar():
+                self._acumular(fecha, puntos, cantidad)
+            self.primero = registros[0]
+            self.ultimo = registros[-1]
+            return
+
+        for registro in registros:
+            self.agregar(registro)
+
+    def agregar(self, registro):
+        """
+        Incorpora un registro. Debe llegar en orden cronológico (por 'hora');
+        si no es así hay que reconstruir el agregador con la lista ordenada.
+        """
+        # Un registro compactado cuenta por todos los que sustituye
+        self._acumular(registro['fecha'], registro['puntos'], registro.get('agrupados', 1))
+        if self.primero is None:
+            self.primero = registro
+        self.ultimo = registro
+
+    def _acumular(self, fecha, puntos, cantidad):
+        """Suma un registro a los totales por día y por mes"""
+        dia = self.por_dia.get(fecha)
+        if dia is None:
+            dia = self.por_dia[fecha] = [0, 0, 0, puntos]
+        dia[2] += cantidad
+
+        if self._puntos_anteriores is not None:
+            diff = puntos - self._puntos_anteriores
+            mes = self.por_mes.get(fecha[:7])
+            if mes is None:
+                mes = self.por_mes[fecha[:7]] = [0, 0]
+
+            if diff > 0:
+                # Es una ganancia
+                dia[0] += diff
+                mes[0] += diff
+            elif diff < -UMBRAL_GASTO_MINIMO:
+                # Es un gasto real (mayor al umbral, no es fluctuación)
+                gasto = -diff
+                self.gasto_total += gasto
+                dia[1] += gasto
+                mes[1] += gasto
+
+        self._puntos_anteriores = puntos
+        self.total_registros += cantidad
+
+    def _promedio_diario(self, ahora):
+        """Crecimiento neto medio por día en la última semana"""
+        limite = (ahora - timedelta(days=7)).date()
+        fin = datetime.strptime(self.ultimo['fecha'], '%Y-%m-%d').date()
+
+        # Buscar el primer día con registros dentro de la ventana
+        registros_semana = 0
+        primer_dia = None
+        dia = limite
+        while dia <= fin:
+            datos = self.por_dia.get(dia.strftime('%Y-%m-%d'))
+            if datos:
+                if primer_dia is None:
+                    primer_dia = (dia, datos[3])
+                registros_semana += datos[2]
+            dia += timedelta(days=1)
+
+        if registros_semana < 2:
+            return 0
+
+        dias = (ahora - datetime.combine(primer_dia[0], datetime.min.time())).days
+        if dias <= 0:
+            return 0
+
+        promedio = (self.ultimo['puntos'] - primer_dia[1]) / dias
+        # No mostrar promedios negativos si gastó mucho
+        return max(promedio, 0)
+
+    def estadisticas(self, ahora=None):
+        """
+        Devuelve las estadísticas del perfil
+
+        Returns:
+            dict con estadísticas o None si no hay registros
+        """
+        if self.ultimo is None:
+            return None
+
+        ahora = ahora or datetime.now()
+        hoy = self.por_dia.get(ahora.strftime('%Y-%m-%d'), (0, 0))
+        mes = self.por_mes.get(ahora.strftime('%Y-%m'), (0, 0))
+
+        return {
+            'puntos_actuales': self.ultimo['puntos'],
+            'ganancia_hoy': hoy[0],
+            'gasto_hoy': hoy[1],
+            'ganancia_mes': mes[0],
+            'gasto_mes': mes[1],
+            'total_gastado': self.gasto_total,
+            'ganancia_total_neta': self.ultimo['puntos'] - self.primero['puntos'],
+            'promedio_diario': int(self._promedio_diario(ahora)),
+            'primer_registro': self.primero['fecha'],
+            'total_registros': self.total_registros
+        }
@@ -0,0 +1,155 @@
+"""
+Caché en memoria del historial de puntos
+Todas las vistas (dashboard, tarjetas de perfil) comparten el mismo historial
+ya parseado. El archivo solo se vuelve a leer cuando cambia su tamaño o su
+fecha de modificación, y como el historial es append-only normalmente basta
+con leer las líneas nuevas.
+Los registros de cada perfil se guardan por columnas (RegistrosPerfil).
+"""
+
+import os
+import threading
+
+import historial_store
+from estadisticas_puntos import AgregadorPerfil
+from registros_perfil import RegistrosPerfil
+
+_lock = threading.Lock()
+_firma = None
+_offset = 0
+_historial = {}
+_agregadores = {}
+
+
+def _firma_archivo():
+    """Devuelve (inode, tamaño, mtime) del historial o None si no existe"""
+    try:
+        st = os.stat(historial_store.HISTORIAL_JSONL)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _perfil(perfil_nombre, email):
+    """Devuelve la entrada de un perfil en el historial (creándola si hace falta)"""
+    perfil = _historial.get(perfil_nombre)
+    if perfil is None:
+        perfil = _historial[perfil_nombre] = {'email': email, 'registros': RegistrosPerfil()}
+    # Un registro sin email (aún no se conocía) no borra el que ya había
+    if email:
+        perfil['email'] = email
+    return perfil
+
+
+def _incorporar(perfil_nombre, email, registro):
+    """Añade un registro nuevo manteniendo el perfil ordenado y su agregador al día"""
+    registros = _perfil(perfil_nombre, email)['registros']
+    registros.agregar(registro)
+    if registros.desordenado():
+        registros.ordenar()
+        _agregadores[perfil_nombre] = AgregadorPerfil(registros)
+    else:
+        agregador = _agregadores.get(perfil_nombre)
+        if agregador is None:
+            agregador = _agregadores[perfil_nombre] = AgregadorPerfil()
+        agregador.agregar(registro)
+
+
+def _cargar_todo():
+    """
+    Lee el historial completo. Los agregadores se construyen después, de una
+    vez por perfil.
+
+    Returns:
+        nuevo offset
+    """
+    global _historial, _agregadores
+
+    _historial = {}
+    desordenados = set()
+
+    def al_leer(perfil_nombre, email, registro):
+        registros = _perfil(perfil_nombre, email)['registros']
+        registros.agregar(registro)
+        if registros.desordenado():
+            desordenados.add(perfil_nombre)
+
+    _, offset = historial_store.leer_registros_desde(0, al_leer=al_leer)
+
+    for perfil_nombre in desordenados:
+        _historial[perfil_nombre]['registros'].ordenar()
+    _agregadores = {
+        perfil_nombre: AgregadorPerfil(datos['registros'])
+        for perfil_nombre, datos in _historial.items()
+    }
+    return offset
+
+
+def obtener_historial():
+    """
+    Devuelve el historial compartido, con los registros de cada perfil
+    ordenados por hora. Es de solo lectura: no modificar el dict devuelto.
+
+    Returns:
+        dict {perfil: {'email': str, 'registros': RegistrosPerfil}}
+    """
+    global _firma, _offset, _historial, _agregadores
+
+    with _lock:
+        historial_store.migrar_historial_legado()
+        firma = _firma_archivo()
+        if firma == _firma:
+            return _historial
+
+        if firma is None:
+            _historial = {}
+            _agregadores = {}
+            _offset = 0
+        else:
+            # Mismo archivo y más grande: solo se leen las líneas añadidas
+            crecio = (_firma is not None and firma[0] == _firma[0]
+                      and firma[1] >= _offset)
+            if crecio:
+                _, _offset = historial_store.leer_registros_desde(_offset, al_leer=_incorporar)
+            else:
+                _offset = _cargar_todo()
+
+        _firma = firma
+        return _historial
+
+
+def obtener_perfil(perfil_nombre):
+    """Devuelve {'email', 'registros' (RegistrosPerfil)} de un perfil o None"""
+    return obtener_historial().get(perfil_nombre)
+
+
+def obtener_agregador(perfil_nombre):
+    """Devuelve el AgregadorPerfil (estadísticas acumuladas) de un perfil o None"""
+    obtener_historial()
+    return _agregadores.get(perfil_nombre)
+
+
+def obtener_agregadores():
+    """
+    Devuelve los agregadores de todos los perfiles de una sola vez
+
+    Returns:
+        list [(perfil, email, AgregadorPerfil), ...] en el orden del historial
+    """
+    obtener_historial()
+    with _lock:
+        return [
+            (perfil_nombre, datos['email'], _agregadores.get(perfil_nombre))
+            for perfil_nombre, datos in _historial.items()
+        ]
+
+
+def invalidar():
+    """Fuerza a releer el archivo completo en la próxima consulta"""
+    global _firma, _offset, _historial, _agregadores
+
+    with _lock:
+        _firma = None
+        _offset = 0
+        _historial = {}
+        _agregadores = {}
@@ -0,0 +1,214 @@
+"""
+Almacenamiento del historial de puntos de Microsoft Rewards
+Guarda cada registro como una línea JSON (formato JSON Lines), de modo que
+registrar unos puntos es un simple append y no reescribe todo el archivo.
+
+Un registro compactado (ver compactacion_historial) lleva además el campo
+'agrupados' con el número de registros originales que representa.
+"""
+
+import json
+import os
+import threading
+
+# Formato anterior: un único JSON anidado {perfil: {'email', 'registros': [...]}}
+HISTORIAL_FILE = "historial_puntos.json"
+
+# Formato actual: una línea por registro
+HISTORIAL_JSONL = "historial_puntos.jsonl"
+
+_lock = threading.Lock()
+
+
+def _linea_registro(perfil_nombre, email, registro):
+    """Serializa un registro como una línea JSON Lines"""
+    datos = {
+        'perfil': perfil_nombre,
+        'email': email,
+        'fecha': registro['fecha'],
+        'hora': registro['hora'],
+        'puntos': registro['puntos']
+    }
+    if registro.get('agrupados', 1) > 1:
+        datos['agrupados'] = registro['agrupados']
+    return json.dumps(datos, ensure_ascii=False) + '\n'
+
+
+def migrar_historial_legado():
+    """
+    Convierte el historial anidado (historial_puntos.json) a JSON Lines.
+    Solo se ejecuta una vez: si el archivo .jsonl ya existe no hace nada.
+    El archivo antiguo se conserva como respaldo.
+
+    Returns:
+        True si se realizó la migración
+    """
+    # La comprobación y la escritura van juntas bajo el lock: si dos hilos
+    # migraran a la vez, el segundo podría pisar un registro recién añadido
+    with _lock:
+        if os.path.exists(HISTORIAL_JSONL) or not os.path.exists(HISTORIAL_FILE):
+            return False
+
+        try:
+            with open(HISTORIAL_FILE, 'r', encoding='utf-8') as f:
+                historial = json.load(f)
+        except Exception as e:
+            print(f"Error al leer historial antiguo: {e}")
+            return False
+
+        _escribir(historial)
+        return True
+
+
+def leer_historial():
+    """
+    Lee el historial completo en el formato anidado de siempre
+
+    Returns:
+        dict {perfil: {'email': str, 'registros': [dict, ...]}}
+    """
+    migrar_historial_legado()
+    return _leer_historial()
+
+
+def _leer_historial():
+    """Lee el historial completo sin migrar (se puede llamar con el lock tomado)"""
+    historial = {}
+    registros, _ = leer_registros_desde(0)
+    for perfil_nombre, email, registro in registros:
+        perfil = historial.setdefault(perfil_nombre, {'email': email, 'registros': []})
+        # Un registro sin email (aún no se conocía) no borra el que ya había
+        if email:
+            perfil['email'] = email
+        perfil['registros'].append(registro)
+
+    return historial
+
+
+def leer_registros_desde(offset, al_leer=None):
+    """
+    Lee los registros escritos a partir de una posición (en bytes) del archivo.
+    Una línea final incompleta no se consume, para leerla entera más adelante.
+
+    Args:
+        offset: Posición desde la que leer
+        al_leer: Si se indica, se llama al_leer(perfil, email, registro) con cada
+            registro en lugar de acumularlos en una lista. El registro es el
+            dict de la línea tal cual (puede traer las claves 'perfil' y 'email')
+
+    Returns:
+        tuple ([(perfil, email, registro), ...], nuevo_offset)
+    """
+    registros = []
+    if al_leer is None:
+        def recibir(posicion, r):
+            registros.append(_registro_de_linea(r))
+    else:
+        def recibir(posicion, r):
+            al_leer(r['perfil'], r.get('email'), r)
+
+    return registros, recorrer_lineas_desde(offset, recibir)
+
+
+def recorrer_lineas_desde(offset, al_leer):
+    """
+    Recorre las líneas completas del archivo a partir de una posición (en bytes)
+    y llama a al_leer(posicion, linea) con cada una ya parseada, donde posicion
+    es el byte en el que empieza. Las líneas corruptas se saltan.
+
+    Returns:
+        nuevo offset (justo después de la última línea completa)
+    """
+    if not os.path.exists(HISTORIAL_JSONL):
+        return 0
+
+    # Se lee línea a línea para no cargar el archivo entero en memoria
+    with open(HISTORIAL_JSONL, 'rb') as f:
+        f.seek(offset)
+        for linea in f:
+            if not linea.endswith(b'\n'):
+                break
+            posicion = offset
+            offset += len(linea)
+            try:
+                r = json.loads(linea)
+            except ValueError:
+                # Línea corrupta (p. ej. cierre inesperado a mitad de escritura)
+                continue
+            al_leer(posicion, r)
+
+    return offset
+
+
+def leer_registros_en(posiciones):
+    """
+    Lee solo las líneas que empiezan en las posiciones indicadas (las guarda el
+    índice de resumen_diario), sin recorrer el resto del archivo
+
+    Returns:
+        list [(perfil, email, registro), ...] en el orden de las posiciones
+    """
+    registros = []
+    if not posiciones:
+        return registros
+
+    with open(HISTORIAL_JSONL, 'rb') as f:
+        for posicion in posiciones:
+            f.seek(posicion)
+            registros.append(_registro_de_linea(json.loads(f.readline())))
+    return registros
+
+
+def _registro_de_linea(r):
+    """Extrae (perfil, email, registro) de una línea ya parseada"""
+    registro = {
+        'fecha': r['fecha'],
+        'hora': r['hora'],
+        'puntos': r['puntos']
+    }
+    if 'agrupados' in r:
+        registro['agrupados'] = r['agrupados']
+    return r['perfil'], r.get('email'), registro
+
+
+def escribir_historial(historial):
+    """
+    Reescribe el historial completo (solo para migraciones o ediciones masivas).
+    Escribe en un archivo temporal y lo renombra para no dejarlo a medias.
+    """
+    with _lock:
+        _escribir(historial)
+
+
+def _escribir(historial):
+    """Escribe el historial completo; quien llama debe tener el lock"""
+    temporal = HISTORIAL_JSONL + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        for perfil_nombre, datos in historial.items():
+            email = datos.get('email')
+            for registro in datos.get('registros', []):
+                f.write(_linea_registro(perfil_nombre, email, registro))
+    os.replace(temporal, HISTORIAL_JSONL)
+
+
+def reescribir_historial(transformar):
+    """
+    Lee el historial, lo transforma y lo reescribe sin soltar el lock, para
+    que no se pierda ningún registro añadido mientras tanto.
+
+    Args:
+        transformar: Función que recibe el historial anidado y devuelve el nuevo
+    """
+    migrar_historial_legado()
+    with _lock:
+        _escribir(transformar(_leer_historial()))
+
+
+def agregar_registro(perfil_nombre, email, registro):
+    """Añade un registro al final del historial sin reescribir el archivo"""
+    migrar_historial_legado()
+
+    linea = _linea_registro(perfil_nombre, email, registro)
+    with _lock:
+        with open(HISTORIAL_JSONL, 'a', encoding='utf-8') as f:
+            f.write(linea)
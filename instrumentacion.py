@@ -0,0 +1,222 @@
+"""
+Instrumentación opcional de las ventanas (GUI y dashboard)
+Mide cuánto tarda cada paso de una acción del usuario (leer el historial,
+calcular estadísticas, construir widgets, dibujar las gráficas...) para poder
+atribuir una interacción lenta a un paso concreto.
+
+Está desactivada por defecto y entonces no cuesta nada. Se activa con la
+opción --perfilar (edge_search_gui.py, puntos_dashboard.py) o con la variable
+de entorno PERFILAR_UI=1. Las medidas se añaden a TRAZA_FILE (una línea JSON
+por paso) y se muestran en un panel con las últimas medidas.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+import tkinter as tk
+from collections import deque
+from datetime import datetime
+from tkinter import ttk
+
+TRAZA_FILE = "perfilado_ui.jsonl"
+
+# Medidas que se conservan en memoria para el panel
+MAX_MEDIDAS = 200
+PANEL_INTERVALO_MS = 500
+
+ACTIVO = os.environ.get('PERFILAR_UI') == '1'
+
+_lock = threading.Lock()
+_medidas = deque(maxlen=MAX_MEDIDAS)
+_total_medidas = 0
+_traza = None
+_panel = None
+
+
+def activar():
+    """Activa la instrumentación (llamar antes de crear las ventanas)"""
+    global ACTIVO
+    ACTIVO = True
+
+
+def registrar(accion, paso, ms):
+    """Guarda una medida en memoria y en el archivo de traza"""
+    global _total_medidas, _traza
+
+    medida = {
+        'hora': datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3],
+        'accion': accion,
+        'paso': paso,
+        'ms': round(ms, 2),
+        'hilo': threading.current_thread().name
+    }
+
+    with _lock:
+        _medidas.append(medida)
+        _total_medidas += 1
+        try:
+            if _traza is None:
+                _traza = open(TRAZA_FILE, 'a', encoding='utf-8')
+                atexit.register(_traza.close)
+            _traza.write(json.dumps(medida, ensure_ascii=False) + '\n')
+            _traza.flush()
+        except Exception as e:
+            print(f"Error al escribir traza de perfilado: {e}")
+
+
+class Accion:
+    """
+    Una acción del usuario (p. ej. seleccionar un perfil) dividida en pasos.
+    Los pasos pueden medirse con un bloque with (paso) o por vueltas (marcar),
+    también desde otros hilos siempre que se ejecuten uno detrás de otro.
+    """
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.inicio = self._vuelta = time.perf_counter()
+        self._terminada = False
+
+    def marcar(self, paso):
+        """Registra el tiempo transcurrido desde la marca anterior (o el inicio)"""
+        ahora = time.perf_counter()
+        registrar(self.nombre, paso, (ahora - self._vuelta) * 1000)
+        self._vuelta = ahora
+
+    def paso(self, paso):
+        """Bloque with que registra lo que tarda su contenido"""
+        return _Paso(self, paso)
+
+    def terminar(self):
+        """Registra el tiempo total de la acción (solo la primera vez)"""
+        if not self._terminada:
+            self._terminada = True
+            registrar(self.nombre, 'total', (time.perf_counter() - self.inicio) * 1000)
+
+
+class _Paso:
+    def __init__(self, accion, paso):
+        self.accion = accion
+        self.paso = paso
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        registrar(self.accion.nombre, self.paso, (time.perf_counter() - self.inicio) * 1000)
+        return False
+
+
+class _AccionInactiva:
+    """Sustituye a Accion cuando la instrumentación está desactivada"""
+
+    def marcar(self, paso):
+        pass
+
+    def paso(self, paso):
+        return self
+
+    def terminar(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+ACCION_INACTIVA = _AccionInactiva()
+
+
+def iniciar(nombre):
+    """Empieza a medir una acción; si la instrumentación está desactivada no hace nada"""
+    return Accion(nombre) if ACTIVO else ACCION_INACTIVA
+
+
+def instrumentar_dibujo(canvas, nombre='Dibujar gráficas'):
+    """Mide cada redibujado de un canvas de matplotlib (también los diferidos con draw_idle)"""
+    if not ACTIVO:
+        return
+
+    dibujar = canvas.draw
+
+    def dibujar_medido(*args, **kwargs):
+        with iniciar(nombre).paso('dibujar canvas'):
+            return dibujar(*args, **kwargs)
+
+    canvas.draw = dibujar_medido
+
+
+class PanelTiempos:
+    """Ventana con las últimas medidas, que se refresca sola"""
+
+    def __init__(self, parent):
+        self.ventana = tk.Toplevel(parent)
+        self.ventana.title("⏱️ Perfilado")
+        self.ventana.geometry("620x360")
+        self._mostradas = -1
+
+        columnas = ('hora', 'accion', 'paso', 'ms')
+        self.tabla = ttk.Treeview(self.ventana, columns=columnas, show='headings')
+        for columna, titulo, ancho, ancla in (
+            ('hora', "Hora", 90, tk.W),
+            ('accion', "Acción", 200, tk.W),
+            ('paso', "Paso", 200, tk.W),
+            ('ms', "ms", 80, tk.E),
+        ):
+            self.tabla.heading(columna, text=titulo)
+            self.tabla.column(columna, width=ancho, anchor=ancla)
+        self.tabla.tag_configure('lento', foreground='#c0392b')
+        self.tabla.tag_configure('total', font=('Arial', 9, 'bold'))
+
+        scroll = ttk.Scrollbar(self.ventana, orient=tk.VERTICAL, command=self.tabla.yview)
+        self.tabla.configure(yscrollcommand=scroll.set)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tabla.pack(fill=tk.BOTH, expand=True)
+
+        tk.Label(
+            self.ventana, text=f"Traza completa: {os.path.abspath(TRAZA_FILE)}",
+            font=('Arial', 8), fg='#888'
+        ).pack(anchor=tk.W)
+
+        self._refrescar()
+
+    def _refrescar(self):
+        """Vuelve a pintar la tabla si hay medidas nuevas"""
+        if not self.ventana.winfo_exists():
+            return
+
+        with _lock:
+            total = _total_medidas
+            medidas = list(_medidas) if total != self._mostradas else None
+
+        if medidas is not None:
+            self._mostradas = total
+            self.tabla.delete(*self.tabla.get_children())
+            # Las más recientes arriba
+            for medida in reversed(medidas):
+                etiquetas = []
+                if medida['paso'] == 'total':
+                    etiquetas.append('total')
+                if medida['ms'] >= 100:
+                    etiquetas.append('lento')
+                self.tabla.insert('', tk.END, values=(
+                    medida['hora'][11:], medida['accion'], medida['paso'], f"{medida['ms']:.1f}"
+                ), tags=etiquetas)
+
+        self.ventana.after(PANEL_INTERVALO_MS, self._refrescar)
+
+
+def mostrar_panel(parent):
+    """Abre el panel de tiempos (uno por aplicación) si la instrumentación está activa"""
+    global _panel
+
+    if not ACTIVO:
+        return
+    if _panel is not None and _panel.ventana.winfo_exists():
+        _panel.ventana.lift()
+        return
+    _panel = PanelTiempos(parent)
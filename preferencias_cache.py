@@ -0,0 +1,112 @@
+"""
+Caché del email de cada perfil de Edge
+El archivo Preferences de un perfil puede ocupar varios MB y solo se necesita
+el email. El resultado se guarda en disco junto con la fecha de modificación
+y el tamaño del archivo, y solo se vuelve a parsear (en segundo plano) cuando
+el Preferences cambia.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+EMAILS_CACHE_FILE = "emails_perfiles_cache.json"
+
+_lock = threading.Lock()
+_cache = None
+_pool = ThreadPoolExecutor(max_workers=2)
+
+
+def _cargar_cache():
+    """Lee la caché de disco la primera vez que se necesita"""
+    global _cache
+
+    if _cache is None:
+        _cache = {}
+        if os.path.exists(EMAILS_CACHE_FILE):
+            try:
+                with open(EMAILS_CACHE_FILE, 'r', encoding='utf-8') as f:
+                    _cache = json.load(f)
+            except Exception:
+                _cache = {}
+    return _cache
+
+
+def _guardar_cache():
+    """Escribe la caché en disco (archivo temporal + renombrado)"""
+    temporal = EMAILS_CACHE_FILE + '.tmp'
+    try:
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(_cache, f, indent=2, ensure_ascii=False)
+        os.replace(temporal, EMAILS_CACHE_FILE)
+    except Exception as e:
+        print(f"Error al guardar caché de emails: {e}")
+
+
+def _firma(prefs_path):
+    """Devuelve (mtime, tamaño) del archivo Preferences"""
+    st = os.stat(prefs_path)
+    return st.st_mtime_ns, st.st_size
+
+
+def extraer_email(prefs):
+    """Obtiene el email de un dict de Preferences ya parseado"""
+    # Intentar obtener email de diferentes ubicaciones
+    if 'account_info' in prefs:
+        for account in prefs['account_info']:
+            if 'email' in account:
+                return account['email']
+
+    if 'profile' in prefs:
+        return prefs['profile'].get('user_name', None)
+
+    return None
+
+
+def consultar(prefs_path):
+    """
+    Busca el email en la caché sin leer el archivo Preferences
+
+    Returns:
+        tuple (encontrado, email); email puede ser None si el perfil no tiene
+    """
+    try:
+        mtime, tamano = _firma(prefs_path)
+    except OSError:
+        return False, None
+
+    with _lock:
+        entrada = _cargar_cache().get(prefs_path)
+
+    if entrada and entrada.get('mtime') == mtime and entrada.get('size') == tamano:
+        return True, entrada.get('email')
+    return False, None
+
+
+def _leer_email(prefs_path):
+    """Parsea el Preferences y guarda el resultado en la caché"""
+    mtime, tamano = _firma(prefs_path)
+    with open(prefs_path, 'r', encoding='utf-8') as f:
+        email = extraer_email(json.load(f))
+
+    with _lock:
+        _cargar_cache()[prefs_path] = {'mtime': mtime, 'size': tamano, 'email': email}
+        _guardar_cache()
+
+    return email
+
+
+def cargar_en_segundo_plano(prefs_path, callback):
+    """
+    Parsea el Preferences en un hilo aparte y llama a callback(email, error)
+    desde ese hilo; quien la reciba no debe llamar a Tk desde él (ni siquiera
+    a after(), que falla si mainloop aún no ha empezado).
+    """
+    def tarea():
+        try:
+            callback(_leer_email(prefs_path), None)
+        except Exception as e:
+            callback(None, e)
+
+    _pool.submit(tarea)
@@ -0,0 +1,158 @@
+"""
+Almacén del progreso diario de búsquedas por perfil
+Las lecturas se sirven desde memoria y las escrituras se acumulan y se
+vuelcan juntas a SQLite (modo WAL) en una sola transacción, con un upsert por
+perfil modificado. Así varios hilos pueden guardar su progreso a la vez sin
+pisarse, y guardar no cuesta más por tener muchos perfiles.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+import threading
+
+# Formato anterior: un JSON con todos los perfiles, reescrito en cada guardado
+PROGRESO_FILE = "progreso_busquedas.json"
+
+PROGRESO_DB = "progreso_busquedas.db"
+
+# Segundos que se esperan para agrupar escrituras antes de volcarlas
+RETARDO_ESCRITURA = 1.0
+
+_lock = threading.RLock()
+_progreso = None
+_modificados = set()
+_temporizador = None
+
+
+def _conectar():
+    """Abre la base de datos y crea la tabla si no existe"""
+    conexion = sqlite3.connect(PROGRESO_DB, timeout=10)
+    conexion.execute("PRAGMA journal_mode=WAL")
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS progreso (
+            perfil TEXT PRIMARY KEY,
+            completadas INTEGER NOT NULL,
+            fecha TEXT NOT NULL,
+            numero INTEGER
+        )
+    """)
+    return conexion
+
+
+def _cargar():
+    """Carga el progreso en memoria (y migra el JSON antiguo la primera vez)"""
+    global _progreso
+
+    if _progreso is not None:
+        return _progreso
+
+    migrar = not os.path.exists(PROGRESO_DB)
+    conexion = _conectar()
+    try:
+        if migrar and os.path.exists(PROGRESO_FILE):
+            try:
+                with open(PROGRESO_FILE, 'r') as f:
+                    datos = json.load(f)
+                with conexion:
+                    conexion.executemany(
+                        "INSERT OR REPLACE INTO progreso (perfil, completadas, fecha, numero) "
+                        "VALUES (?, ?, ?, ?)",
+                        [(perfil, info.get('completadas', 0), info.get('fecha', ''), info.get('numero'))
+                         for perfil, info in datos.items()]
+                    )
+            except Exception as e:
+                print(f"Error al migrar progreso antiguo: {e}")
+
+        _progreso = {
+            perfil: {'completadas': completadas, 'fecha': fecha, 'numero': numero}
+            for perfil, completadas, fecha, numero in conexion.execute(
+                "SELECT perfil, completadas, fecha, numero FROM progreso"
+            )
+        }
+    finally:
+        conexion.close()
+
+    return _progreso
+
+
+def _programar_escritura():
+    """Programa un volcado a disco si no hay uno pendiente"""
+    global _temporizador
+
+    if _temporizador is None:
+        _temporizador = threading.Timer(RETARDO_ESCRITURA, guardar_pendientes)
+        _temporizador.daemon = True
+        _temporizador.start()
+
+
+def obtener(perfil_nombre):
+    """Devuelve una copia del progreso de un perfil ({'completadas', 'fecha', 'numero'}) o None"""
+    with _lock:
+        info = _cargar().get(perfil_nombre)
+        return dict(info) if info else None
+
+
+def guardar(perfil_nombre, completadas, fecha, numero):
+    """Guarda (upsert) el progreso de un perfil; se escribe a disco en el próximo volcado"""
+    with _lock:
+        _cargar()[perfil_nombre] = {'completadas': completadas, 'fecha': fecha, 'numero': numero}
+        _modificados.add(perfil_nombre)
+        _programar_escritura()
+
+
+def eliminar(perfil_nombre):
+    """Elimina el progreso de un perfil"""
+    with _lock:
+        if _cargar().pop(perfil_nombre, None) is not None:
+            _modificados.add(perfil_nombre)
+            _programar_escritura()
+
+
+def conservar_solo_fecha(prefijo_fecha):
+    """Elimina el progreso de los perfiles cuya fecha no empieza por prefijo_fecha (ej: '2026-02-04')"""
+    with _lock:
+        for perfil, info in list(_cargar().items()):
+            if not info.get('fecha', '').startswith(prefijo_fecha):
+                eliminar(perfil)
+
+
+def guardar_pendientes():
+    """Vuelca a disco en una sola transacción los perfiles modificados"""
+    global _temporizador
+
+    with _lock:
+        _temporizador = None
+        if not _modificados:
+            return
+
+        cambios = [(perfil, _progreso.get(perfil)) for perfil in _modificados]
+        _modificados.clear()
+
+        try:
+            conexion = _conectar()
+            try:
+                with conexion:
+                    for perfil, info in cambios:
+                        if info is None:
+                            conexion.execute("DELETE FROM progreso WHERE perfil = ?", (perfil,))
+                        else:
+                            conexion.execute(
+                                "INSERT INTO progreso (perfil, completadas, fecha, numero) "
+                                "VALUES (?, ?, ?, ?) "
+                                "ON CONFLICT(perfil) DO UPDATE SET "
+                                "completadas = excluded.completadas, fecha = excluded.fecha, "
+                                "numero = excluded.numero",
+                                (perfil, info['completadas'], info['fecha'], info['numero'])
+                            )
+            finally:
+                conexion.close()
+        except Exception as e:
+            print(f"Error al guardar progreso: {e}")
+            # Reintentar en el próximo volcado
+            _modificados.update(perfil for perfil, _ in cambios)
+
+
+# No perder lo pendiente al cerrar la aplicación
+atexit.register(guardar_pendientes)
@@ -1,45 +1,103 @@
 """
 Dashboard de Puntos de Microsoft Rewards
 Muestra estadísticas, historial y gráficas de los puntos ganados
+
+Uso: python puntos_dashboard.py [--perfilar] [--compactar [--dias N]] [--reporte [DIR]]
+  --perfilar   Mide cada paso de las acciones (ver instrumentacion)
+  --compactar  Compacta el historial (ver compactacion_historial) y sale
+  --reporte    Genera el reporte PNG/HTML sin abrir ventanas (ver reporte_puntos) y sale
 """
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-import json
-import os
+import importlib.util
 from datetime import datetime, timedelta
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import historial_cache
+import historial_store
+import instrumentacion
+import resumen_diario
+from analitica_puntos import media_movil
 
-# Intentar importar matplotlib
-try:
-    import matplotlib.pyplot as plt
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    from matplotlib.figure import Figure
-    import matplotlib.dates as mdates
-    MATPLOTLIB_DISPONIBLE = True
-except ImportError:
-    MATPLOTLIB_DISPONIBLE = False
+# Comprobar si matplotlib está instalado sin importarlo todavía (tarda en cargar);
+# se importa la primera vez que hace falta dibujar (ver _cargar_matplotlib)
+MATPLOTLIB_DISPONIBLE = importlib.util.find_spec('matplotlib') is not None
+if not MATPLOTLIB_DISPONIBLE:
     print("⚠️ matplotlib no está instalado. Ejecuta: pip install matplotlib")
 
-HISTORIAL_FILE = "historial_puntos.json"
+FigureCanvasTkAgg = Figure = mdates = None
+
+
+def _cargar_matplotlib():
+    """Importa los módulos de matplotlib que usa el dashboard"""
+    global FigureCanvasTkAgg, Figure, mdates
+    
+    if Figure is None:
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        import matplotlib.dates as mdates
+        from matplotlib.figure import Figure
 
 
 def cargar_historial():
-    """Carga el historial de puntos desde el archivo JSON"""
-    if os.path.exists(HISTORIAL_FILE):
-        try:
-            with open(HISTORIAL_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
+    """Carga el historial de puntos (migra el formato antiguo si hace falta)"""
+    try:
+        return historial_store.leer_historial()
+    except Exception:
+        return {}
+
+
+def cargar_perfil(perfil_nombre, ultimos=None):
+    """
+    Carga un solo perfil del historial sin leer el archivo entero (usa el
+    índice de posiciones de resumen_diario)
+    
+    Args:
+        perfil_nombre: Nombre del perfil (ej: 'Profile 2')
+        ultimos: Si se indica, solo los N últimos registros
+    
+    Returns:
+        dict {'email', 'registros'} con los registros en el orden en que se
+        escribieron, o None si el perfil no tiene registros
+    """
+    try:
+        # El índice guarda el último email conocido (los registros pueden no traerlo)
+        email, posiciones = resumen_diario.consultar_posiciones(perfil_nombre, ultimos)
+        if not posiciones:
+            return None
+        registros = historial_store.leer_registros_en(posiciones)
+    except Exception as e:
+        print(f"Error al cargar perfil {perfil_nombre}: {e}")
+        return None
+    
+    return {'email': email, 'registros': [r for _, _, r in registros]}
+
+
+def cargar_ultimos_registros():
+    """
+    Obtiene el último registro de cada perfil leyendo solo esas líneas
+    
+    Returns:
+        dict {perfil: {'email', 'ultimo'}} en el orden en que aparecieron los perfiles
+    """
+    try:
+        perfiles = resumen_diario.consultar_perfiles()
+        ultimos = historial_store.leer_registros_en([posicion for _, _, posicion in perfiles])
+    except Exception as e:
+        print(f"Error al cargar últimos registros: {e}")
+        return {}
+    
+    return {
+        perfil: {'email': email, 'ultimo': registro}
+        for (perfil, email, _), (_, _, registro) in zip(perfiles, ultimos)
+    }
 
 
 def guardar_historial(historial):
-    """Guarda el historial de puntos en el archivo JSON"""
+    """Reescribe el historial de puntos completo"""
     try:
-        with open(HISTORIAL_FILE, 'w', encoding='utf-8') as f:
-            json.dump(historial, f, indent=2, ensure_ascii=False)
+        historial_store.escribir_historial(historial)
     except Exception as e:
         print(f"Error al guardar historial: {e}")
 
@@ -61,28 +119,19 @@ def registrar_puntos(perfil_nombre, email, puntos):
     except:
         return
     
-    historial = cargar_historial()
-    
-    fecha_hora = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    fecha = datetime.now().strftime('%Y-%m-%d')
-    
-    if perfil_nombre not in historial:
-        historial[perfil_nombre] = {
-            'email': email,
-            'registros': []
-        }
-    
-    # Actualizar email por si cambió
-    historial[perfil_nombre]['email'] = email
-    
-    # Añadir registro
-    historial[perfil_nombre]['registros'].append({
-        'fecha': fecha,
-        'hora': fecha_hora,
+    ahora = datetime.now()
+    registro = {
+        'fecha': ahora.strftime('%Y-%m-%d'),
+        'hora': ahora.strftime('%Y-%m-%d %H:%M:%S'),
         'puntos': puntos_int
-    })
+    }
     
-    guardar_historial(historial)
+    # Añadir registro al final del archivo (no se reescribe el historial)
+    try:
+        historial_store.agregar_registro(perfil_nombre, email, registro)
+        resumen_diario.sincronizar()
+    except Exception as e:
+        print(f"Error al guardar historial: {e}")
 
 
 def obtener_estadisticas(perfil_nombre):
@@ -92,89 +141,39 @@ def obtener_estadisticas(perfil_nombre):
     Returns:
         dict con estadísticas o None
     """
-    historial = cargar_historial()
-    
-    if perfil_nombre not in historial:
+    # Los totales se mantienen al día en la caché a medida que llegan registros
+    agregador = historial_cache.obtener_agregador(perfil_nombre)
+    if agregador is None:
         return None
     
-    registros = historial[perfil_nombre]['registros']
-    if not registros:
-        return None
-    
-    # Ordenar por fecha
-    registros_ordenados = sorted(registros, key=lambda x: x['hora'])
-    
-    # Puntos actuales (último registro)
-    puntos_actuales = registros_ordenados[-1]['puntos']
-    
-    # Primer registro
-    primer_registro = registros_ordenados[0]
-    
-    # Calcular flujos (Ganancias y Gastos) recorriendo todo el historial
-    ganancia_neta_total = puntos_actuales - primer_registro['puntos']
-    
-    # Definir fechas de referencia
-    hoy = datetime.now().strftime('%Y-%m-%d')
-    mes_actual = datetime.now().strftime('%Y-%m')
-    
-    ganancia_bruta_hoy = 0
-    gasto_hoy = 0
-    
-    ganancia_bruta_mes = 0
-    gasto_mes = 0
-    
-    gasto_total = 0
-    
-    # Umbral mínimo para considerar un gasto real (ignorar fluctuaciones de la página)
-    # Los canjes mínimos en Rewards suelen ser de 100+ puntos
-    UMBRAL_GASTO_MINIMO = 50
-    
-    # Recorrer historial para detectar cambios
-    prev_r = registros_ordenados[0]
-    
-    for r in registros_ordenados[1:]:
-        diff = r['puntos'] - prev_r['puntos']
-        
-        fecha_r = r['fecha']
-        es_hoy = (fecha_r == hoy)
-        es_mes = fecha_r.startswith(mes_actual)
-        
-        if diff > 0:
-            # Es una ganancia
-            if es_hoy: ganancia_bruta_hoy += diff
-            if es_mes: ganancia_bruta_mes += diff
-        elif diff < -UMBRAL_GASTO_MINIMO:
-            # Es un gasto real (mayor al umbral, no es fluctuación)
-            gasto = abs(diff)
-            gasto_total += gasto
-            if es_hoy: gasto_hoy += gasto
-            if es_mes: gasto_mes += gasto
-            
-        prev_r = r
+    return agregador.estadisticas()
 
-    # Promedio diario de ganancias (Neto vs Bruto? Mejor Neto para ver crecimiento real)
-    hace_7_dias = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-    registros_semana = [r for r in registros_ordenados if r['fecha'] >= hace_7_dias]
-    
-    promedio_diario = 0
-    if len(registros_semana) >= 2:
-        dias = (datetime.now() - datetime.strptime(registros_semana[0]['fecha'], '%Y-%m-%d')).days
-        if dias > 0:
-            promedio_diario = (registros_semana[-1]['puntos'] - registros_semana[0]['puntos']) / dias
-            if promedio_diario < 0: promedio_diario = 0 # No mostrar promedios negativos si gastó mucho
+
+# Estadísticas que se suman entre perfiles en el resumen general
+CLAVES_TOTALES = ('puntos_actuales', 'ganancia_hoy', 'ganancia_mes', 'gasto_mes', 'total_gastado')
+
+
+def obtener_estadisticas_todos(ahora=None):
+    """
+    Obtiene las estadísticas de todos los perfiles y sus totales en una sola
+    pasada, con la misma fecha de referencia para todos
     
-    return {
-        'puntos_actuales': puntos_actuales,
-        'ganancia_hoy': ganancia_bruta_hoy,
-        'gasto_hoy': gasto_hoy,
-        'ganancia_mes': ganancia_bruta_mes,
-        'gasto_mes': gasto_mes,
-        'total_gastado': gasto_total,
-        'ganancia_total_neta': ganancia_neta_total,
-        'promedio_diario': int(promedio_diario),
-        'primer_registro': primer_registro['fecha'],
-        'total_registros': len(registros_ordenados)
-    }
+    Returns:
+        tuple (filas, totales) donde filas = [(perfil, email, stats o None), ...]
+        en el orden del historial y totales = {clave: suma} para CLAVES_TOTALES
+    """
+    ahora = ahora or datetime.now()
+    filas = []
+    totales = dict.fromkeys(CLAVES_TOTALES, 0)
+    
+    for perfil_nombre, email, agregador in historial_cache.obtener_agregadores():
+        stats = agregador.estadisticas(ahora) if agregador else None
+        if stats:
+            for clave in CLAVES_TOTALES:
+                totales[clave] += stats[clave]
+        filas.append((perfil_nombre, email or 'Sin email', stats))
+    
+    return filas, totales
 
 
 def obtener_datos_grafica(perfil_nombre, dias=30):
@@ -184,30 +183,14 @@ def obtener_datos_grafica(perfil_nombre, dias=30):
     Returns:
         tuple (fechas, puntos) o (None, None)
     """
-    historial = cargar_historial()
-    
-    if perfil_nombre not in historial:
-        return None, None
-    
-    registros = historial[perfil_nombre]['registros']
-    if not registros:
-        return None, None
-    
-    # Agrupar por día (tomar el último registro de cada día)
-    por_dia = {}
-    for r in registros:
-        fecha = r['fecha']
-        por_dia[fecha] = r['puntos']
-    
-    # Filtrar últimos N días
     fecha_limite = (datetime.now() - timedelta(days=dias)).strftime('%Y-%m-%d')
+    total, filas = resumen_diario.consultar(perfil_nombre, desde=fecha_limite)
+    if not total:
+        return None, None
     
-    fechas = []
-    puntos = []
-    for fecha in sorted(por_dia.keys()):
-        if fecha >= fecha_limite:
-            fechas.append(datetime.strptime(fecha, '%Y-%m-%d'))
-            puntos.append(por_dia[fecha])
+    # El resumen ya guarda el último registro de cada día
+    fechas = [datetime.fromisoformat(fila[0]) for fila in filas]
+    puntos = [fila[1] for fila in filas]
     
     return fechas, puntos
 
@@ -219,51 +202,51 @@ def obtener_ganancia_diaria(perfil_nombre, dias=30):
     Returns:
         tuple (fechas, ganancias) o (None, None)
     """
-    historial = cargar_historial()
-    
-    if perfil_nombre not in historial:
-        return None, None
-    
-    registros = historial[perfil_nombre]['registros']
-    if len(registros) < 2:
-        return None, None
-    
-    # Agrupar por día
-    por_dia = {}
-    for r in registros:
-        fecha = r['fecha']
-        if fecha not in por_dia:
-            por_dia[fecha] = {'min': r['puntos'], 'max': r['puntos']}
-        else:
-            por_dia[fecha]['min'] = min(por_dia[fecha]['min'], r['puntos'])
-            por_dia[fecha]['max'] = max(por_dia[fecha]['max'], r['puntos'])
-    
-    # Calcular ganancia diaria
     fecha_limite = (datetime.now() - timedelta(days=dias)).strftime('%Y-%m-%d')
-    fechas_ordenadas = sorted([f for f in por_dia.keys() if f >= fecha_limite])
+    total, filas = resumen_diario.consultar(perfil_nombre, desde=fecha_limite)
+    if total < 2:
+        return None, None
     
     fechas = []
     ganancias = []
     
-    for i, fecha in enumerate(fechas_ordenadas):
+    for i, (fecha, _, minimo, maximo) in enumerate(filas):
         if i == 0:
             # Primer día: usar diferencia dentro del mismo día
-            ganancia = por_dia[fecha]['max'] - por_dia[fecha]['min']
+            ganancia = maximo - minimo
         else:
             # Días siguientes: comparar con el máximo del día anterior
-            fecha_anterior = fechas_ordenadas[i-1]
-            ganancia = por_dia[fecha]['max'] - por_dia[fecha_anterior]['max']
+            ganancia = maximo - filas[i-1][3]
         
-        fechas.append(datetime.strptime(fecha, '%Y-%m-%d'))
+        fechas.append(datetime.fromisoformat(fecha))
         ganancias.append(max(0, ganancia))  # No mostrar ganancias negativas
     
     return fechas, ganancias
 
 
+def estilizar_ejes(ax, titulo):
+    """Aplica el estilo oscuro del dashboard a unos ejes (también en el reporte)"""
+    from matplotlib.dates import DateFormatter
+    
+    ax.set_facecolor('#0f3460')
+    ax.set_title(titulo, color='white', fontsize=12, pad=10)
+    ax.tick_params(colors='white')
+    ax.tick_params(axis='x', labelrotation=30)
+    ax.spines['bottom'].set_color('white')
+    ax.spines['left'].set_color('white')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.yaxis.label.set_color('white')
+    ax.xaxis.label.set_color('white')
+    ax.xaxis_date()
+    ax.xaxis.set_major_formatter(DateFormatter('%d/%m'))
+
+
 class DashboardWindow:
     """Ventana del Dashboard de Puntos"""
     
     def __init__(self, parent=None):
+        accion = instrumentacion.iniciar("Abrir dashboard")
         if parent:
             self.root = tk.Toplevel(parent)
         else:
@@ -274,9 +257,62 @@ class DashboardWindow:
         self.root.configure(bg='#1a1a2e')
         
         self.perfil_seleccionado = None
+        self.perfiles_nombres = []
+        
+        # Pool para leer el historial y calcular estadísticas fuera del hilo de Tk
+        self._pool = ThreadPoolExecutor(max_workers=2)
+        # Última solicitud de cada canal ('lista', 'panel'); las anteriores se descartan
+        self._solicitudes = {}
+        self.root.protocol("WM_DELETE_WINDOW", self._cerrar)
+        # Acción en curso en el panel derecho (solo se mide con --perfilar)
+        self._accion_panel = instrumentacion.ACCION_INACTIVA
         
         self._crear_ui()
+        accion.marcar("construir widgets")
         self._cargar_datos()
+        accion.terminar()
+        instrumentacion.mostrar_panel(self.root)
+        
+        # Ir importando matplotlib mientras el usuario elige un perfil
+        if MATPLOTLIB_DISPONIBLE:
+            self._pool.submit(_cargar_matplotlib)
+    
+    def _en_segundo_plano(self, canal, tarea, al_terminar):
+        """
+        Ejecuta tarea() en el pool y entrega su resultado a al_terminar en el hilo de Tk.
+        Si llega otra solicitud por el mismo canal antes de terminar, el resultado se descarta.
+        """
+        solicitud = self._solicitudes.get(canal, 0) + 1
+        self._solicitudes[canal] = solicitud
+        
+        def entregar(futuro):
+            try:
+                self.root.after(0, lambda: self._entregar_resultado(canal, solicitud, futuro, al_terminar))
+            except (RuntimeError, tk.TclError):
+                pass  # La ventana ya se cerró
+        
+        self._pool.submit(tarea).add_done_callback(entregar)
+    
+    def _entregar_resultado(self, canal, solicitud, futuro, al_terminar):
+        """Aplica en la UI el resultado de una tarea si sigue siendo la más reciente"""
+        if self._solicitudes.get(canal) != solicitud:
+            return
+        
+        try:
+            resultado = futuro.result()
+        except Exception as e:
+            print(f"Error al cargar datos del dashboard: {e}")
+            if canal == 'panel':
+                self._mostrar_mensaje(f"❌ Error al cargar datos: {e}", '#e74c3c')
+            return
+        
+        al_terminar(resultado)
+    
+    def _cerrar(self):
+        """Cierra la ventana y descarta las tareas pendientes"""
+        self._solicitudes.clear()
+        self._pool.shutdown(wait=False)
+        self.root.destroy()
     
     def _crear_ui(self):
         """Crea la interfaz del dashboard"""
@@ -355,42 +391,79 @@ class DashboardWindow:
         self.right_panel = tk.Frame(main_container, bg='#1a1a2e')
         self.right_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
+        # Contenido que se reconstruye en cada vista; las gráficas van aparte
+        # (self.graficas_frame) porque se reutilizan entre perfiles
+        self.contenido = tk.Frame(self.right_panel, bg='#1a1a2e')
+        self.contenido.pack(fill=tk.BOTH, expand=True)
+        
         # Placeholder inicial
         self._mostrar_placeholder()
     
     def _mostrar_placeholder(self):
         """Muestra mensaje inicial"""
-        for widget in self.right_panel.winfo_children():
+        self._mostrar_mensaje("👈 Selecciona un perfil para ver las estadísticas", '#888', 16)
+    
+    def _limpiar_panel(self, expandir=True):
+        """Vacía el contenido del panel derecho y oculta las vistas persistentes"""
+        for widget in self.contenido.winfo_children():
             widget.destroy()
+        if hasattr(self, 'graficas_frame'):
+            self.graficas_frame.pack_forget()
+        if hasattr(self, 'resumen_frame'):
+            self.resumen_frame.pack_forget()
+        self.contenido.pack_configure(fill=tk.BOTH if expandir else tk.X, expand=expandir)
+    
+    def _mostrar_mensaje(self, texto, color='#888', tamano=14):
+        """Limpia el panel derecho y muestra un mensaje centrado"""
+        self._limpiar_panel()
         
         tk.Label(
-            self.right_panel,
-            text="👈 Selecciona un perfil para ver las estadísticas",
-            font=('Arial', 16),
+            self.contenido,
+            text=texto,
+            font=('Arial', tamano),
             bg='#1a1a2e',
-            fg='#888'
+            fg=color
         ).pack(expand=True)
     
     def _cargar_datos(self):
         """Carga los perfiles en la lista"""
         self.perfiles_listbox.delete(0, tk.END)
+        self.perfiles_listbox.insert(tk.END, "⏳ Cargando...")
+        self.perfiles_nombres = []
+        accion = instrumentacion.iniciar("Cargar lista de perfiles")
+        
+        def tarea():
+            # Solo hace falta el último registro de cada perfil
+            perfiles = [
+                (perfil, datos['email'] or 'Sin email', datos['ultimo']['puntos'])
+                for perfil, datos in cargar_ultimos_registros().items()
+            ]
+            accion.marcar("leer últimos registros")
+            return perfiles
+        
+        def pintar(perfiles):
+            accion.marcar("esperar al hilo de la UI")
+            self._pintar_lista_perfiles(perfiles)
+            accion.marcar("pintar lista")
+            accion.terminar()
+        
+        self._en_segundo_plano('lista', tarea, pintar)
+    
+    def _pintar_lista_perfiles(self, perfiles):
+        """Rellena la lista de perfiles con los datos ya cargados"""
+        self.perfiles_listbox.delete(0, tk.END)
         
-        historial = cargar_historial()
-        
-        if not historial:
+        if not perfiles:
             self.perfiles_listbox.insert(tk.END, "No hay datos aún...")
             return
         
-        for perfil, datos in historial.items():
-            email = datos.get('email', 'Sin email')
-            registros = datos.get('registros', [])
-            if registros:
-                ultimo_puntos = registros[-1]['puntos']
+        for perfil, email, ultimo_puntos in perfiles:
+            if ultimo_puntos is not None:
                 self.perfiles_listbox.insert(tk.END, f"💰 {ultimo_puntos:,} - {email}")
             else:
                 self.perfiles_listbox.insert(tk.END, f"❓ {email}")
         
-        self.perfiles_nombres = list(historial.keys())
+        self.perfiles_nombres = [perfil for perfil, _, _ in perfiles]
     
     def _on_perfil_select(self, event):
         """Maneja la selección de un perfil"""
@@ -415,42 +488,68 @@ class DashboardWindow:
             fg='#aaa'
         ).pack(anchor=tk.W)
         
-        tk.Label(
+        # Se guarda la etiqueta del valor para poder actualizarla sin recrear la tarjeta
+        card.valor_label = tk.Label(
             card,
             text=str(valor),
             font=('Arial', 24, 'bold'),
             bg=color,
             fg='white'
-        ).pack(anchor=tk.W, pady=(5, 0))
+        )
+        card.valor_label.pack(anchor=tk.W, pady=(5, 0))
         
         return card
     
     def _mostrar_dashboard_perfil(self, perfil_nombre):
         """Muestra el dashboard de un perfil específico"""
-        # Limpiar panel
-        for widget in self.right_panel.winfo_children():
-            widget.destroy()
-        
-        historial = cargar_historial()
-        if perfil_nombre not in historial:
+        self._mostrar_mensaje("⏳ Cargando estadísticas...")
+        accion = instrumentacion.iniciar(f"Seleccionar {perfil_nombre}")
+        
+        def tarea():
+            perfil = historial_cache.obtener_perfil(perfil_nombre)
+            accion.marcar("cargar historial")
+            if perfil is None:
+                return None
+            
+            datos = {
+                'email': perfil.get('email') or 'Sin email',
+                'stats': obtener_estadisticas(perfil_nombre)
+            }
+            accion.marcar("calcular estadísticas")
+            if datos['stats'] and MATPLOTLIB_DISPONIBLE:
+                datos['evolucion'] = obtener_datos_grafica(perfil_nombre, dias=30)
+                fechas_g, ganancias = obtener_ganancia_diaria(perfil_nombre, dias=14)
+                datos['ganancia'] = (fechas_g, ganancias, media_movil(ganancias or [], 7))
+                accion.marcar("consultar datos de gráficas")
+            return datos
+        
+        def pintar(datos):
+            accion.marcar("esperar al hilo de la UI")
+            self._accion_panel = accion
+            self._pintar_dashboard_perfil(perfil_nombre, datos)
+            self._accion_panel = instrumentacion.ACCION_INACTIVA
+            accion.terminar()
+        
+        self._en_segundo_plano('panel', tarea, pintar)
+    
+    def _pintar_dashboard_perfil(self, perfil_nombre, datos):
+        """Construye el dashboard de un perfil con los datos ya calculados"""
+        if datos is None:
             self._mostrar_placeholder()
             return
         
-        email = historial[perfil_nombre].get('email', 'Sin email')
-        stats = obtener_estadisticas(perfil_nombre)
+        email = datos['email']
+        stats = datos['stats']
         
         if not stats:
-            tk.Label(
-                self.right_panel,
-                text="No hay suficientes datos para mostrar estadísticas",
-                font=('Arial', 14),
-                bg='#1a1a2e',
-                fg='#888'
-            ).pack(expand=True)
+            self._mostrar_mensaje("No hay suficientes datos para mostrar estadísticas")
             return
         
+        # Limpiar panel
+        self._limpiar_panel(expandir=False)
+        
         # Header del perfil
-        header_frame = tk.Frame(self.right_panel, bg='#1a1a2e')
+        header_frame = tk.Frame(self.contenido, bg='#1a1a2e')
         header_frame.pack(fill=tk.X, pady=(0, 20))
         
         tk.Label(
@@ -470,7 +569,7 @@ class DashboardWindow:
         ).pack(anchor=tk.W)
         
         # Grid de estadísticas
-        stats_frame = tk.Frame(self.right_panel, bg='#1a1a2e')
+        stats_frame = tk.Frame(self.contenido, bg='#1a1a2e')
         stats_frame.pack(fill=tk.X, pady=(0, 20))
         
         # Configurar grid (4 columnas, 2 filas)
@@ -548,157 +647,173 @@ class DashboardWindow:
             )
             card7.grid(row=1, column=3, padx=5, pady=5, sticky='nsew')
         
+        self._accion_panel.marcar("construir tarjetas")
+        
         # Gráficas
         if MATPLOTLIB_DISPONIBLE:
-            self._mostrar_graficas(perfil_nombre)
+            self._mostrar_graficas(datos)
         else:
             tk.Label(
-                self.right_panel,
+                self.contenido,
                 text="⚠️ Instala matplotlib para ver gráficas: pip install matplotlib",
                 font=('Arial', 12),
                 bg='#1a1a2e',
                 fg='#f39c12'
             ).pack(pady=20)
     
-    def _mostrar_graficas(self, perfil_nombre):
-        """Muestra las gráficas de puntos"""
-        # Frame para gráficas
-        graficas_frame = tk.Frame(self.right_panel, bg='#1a1a2e')
-        graficas_frame.pack(fill=tk.BOTH, expand=True)
+    def _crear_graficas(self):
+        """Crea una sola vez la figura, los ejes y el canvas de las gráficas"""
+        _cargar_matplotlib()
+        self.graficas_frame = tk.Frame(self.right_panel, bg='#1a1a2e')
         
         # Crear figura con 2 subplots
-        fig = Figure(figsize=(10, 5), dpi=100, facecolor='#1a1a2e')
+        self.fig = Figure(figsize=(10, 5), dpi=100, facecolor='#1a1a2e')
         
         # Gráfica 1: Evolución de puntos
-        ax1 = fig.add_subplot(121)
-        ax1.set_facecolor('#0f3460')
-        ax1.set_title('📈 Evolución de Puntos', color='white', fontsize=12, pad=10)
+        self.ax1 = self.fig.add_subplot(121)
+        estilizar_ejes(self.ax1, '📈 Evolución de Puntos')
+        self.ax1.xaxis.set_major_locator(mdates.DayLocator(interval=5))
+        self.linea_puntos, = self.ax1.plot(
+            [], [], color='#e94560', linewidth=2, marker='o', markersize=4
+        )
+        self.relleno_puntos = None
+        
+        # Gráfica 2: Ganancia diaria (las barras se reutilizan entre perfiles)
+        self.ax2 = self.fig.add_subplot(122)
+        estilizar_ejes(self.ax2, '📊 Ganancia Diaria')
+        self.ax2.xaxis.set_major_locator(mdates.DayLocator(interval=2))
+        self.barras_ganancia = []
+        # Media móvil de 7 días para ver la tendencia
+        self.linea_media, = self.ax2.plot(
+            [], [], color='#f39c12', linewidth=1.5, linestyle='--'
+        )
         
-        fechas, puntos = obtener_datos_grafica(perfil_nombre, dias=30)
+        self.fig.tight_layout(pad=2.0)
+        
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.graficas_frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        instrumentacion.instrumentar_dibujo(self.canvas)
+    
+    def _mostrar_graficas(self, datos):
+        """Muestra las gráficas de puntos actualizando solo los datos de la figura"""
+        if not hasattr(self, 'canvas'):
+            self._crear_graficas()
+            self._accion_panel.marcar("crear figura")
+        
+        # Gráfica 1: Evolución de puntos
+        fechas, puntos = datos['evolucion']
+        x = mdates.date2num(fechas) if fechas else []
+        self.linea_puntos.set_data(x, puntos or [])
+        if self.relleno_puntos is not None:
+            self.relleno_puntos.remove()
+            self.relleno_puntos = None
         if fechas and puntos:
-            ax1.plot(fechas, puntos, color='#e94560', linewidth=2, marker='o', markersize=4)
-            ax1.fill_between(fechas, puntos, alpha=0.3, color='#e94560')
-            ax1.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m'))
-            ax1.xaxis.set_major_locator(mdates.DayLocator(interval=5))
-            fig.autofmt_xdate()
-        
-        ax1.tick_params(colors='white')
-        ax1.spines['bottom'].set_color('white')
-        ax1.spines['left'].set_color('white')
-        ax1.spines['top'].set_visible(False)
-        ax1.spines['right'].set_visible(False)
-        ax1.yaxis.label.set_color('white')
-        ax1.xaxis.label.set_color('white')
+            self.relleno_puntos = self.ax1.fill_between(x, puntos, alpha=0.3, color='#e94560')
         
         # Gráfica 2: Ganancia diaria
-        ax2 = fig.add_subplot(122)
-        ax2.set_facecolor('#0f3460')
-        ax2.set_title('📊 Ganancia Diaria', color='white', fontsize=12, pad=10)
-        
-        fechas_g, ganancias = obtener_ganancia_diaria(perfil_nombre, dias=14)
-        if fechas_g and ganancias:
-            colors = ['#27ae60' if g > 0 else '#e74c3c' for g in ganancias]
-            ax2.bar(fechas_g, ganancias, color=colors, alpha=0.8)
-            ax2.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m'))
-            ax2.xaxis.set_major_locator(mdates.DayLocator(interval=2))
-        
-        ax2.tick_params(colors='white')
-        ax2.spines['bottom'].set_color('white')
-        ax2.spines['left'].set_color('white')
-        ax2.spines['top'].set_visible(False)
-        ax2.spines['right'].set_visible(False)
-        
-        fig.tight_layout(pad=2.0)
-        
-        # Añadir canvas
-        canvas = FigureCanvasTkAgg(fig, master=graficas_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        fechas_g, ganancias, media = datos['ganancia']
+        x_g = mdates.date2num(fechas_g) if fechas_g else []
+        ganancias = ganancias or []
+        
+        # Crear barras solo si hacen falta más que en cualquier perfil anterior
+        while len(self.barras_ganancia) < len(ganancias):
+            self.barras_ganancia.extend(self.ax2.bar([0], [0], alpha=0.8).patches)
+        
+        for i, barra in enumerate(self.barras_ganancia):
+            if i < len(ganancias):
+                barra.set_x(x_g[i] - barra.get_width() / 2)
+                barra.set_height(ganancias[i])
+                barra.set_color('#27ae60' if ganancias[i] > 0 else '#e74c3c')
+                barra.set_visible(True)
+            else:
+                barra.set_visible(False)
+        self.linea_media.set_data(x_g, media if ganancias else [])
+        
+        for ax in (self.ax1, self.ax2):
+            ax.relim(visible_only=True)
+            ax.autoscale_view()
+        
+        # Cada perfil cambia la escala de los ejes, así que no se puede usar blit:
+        # se pide un redibujado diferido y se reutiliza el mismo canvas
+        self.canvas.draw_idle()
+        self.graficas_frame.pack(fill=tk.BOTH, expand=True)
+        # El dibujado en sí se mide aparte, cuando se ejecuta ("Dibujar gráficas")
+        self._accion_panel.marcar("actualizar gráficas")
     
     def _mostrar_resumen_general(self):
         """Muestra un resumen de todos los perfiles"""
-        for widget in self.right_panel.winfo_children():
-            widget.destroy()
+        self._mostrar_mensaje("⏳ Calculando resumen...")
+        accion = instrumentacion.iniciar("Resumen general")
         
-        historial = cargar_historial()
+        def tarea():
+            historial_cache.obtener_historial()
+            accion.marcar("cargar historial")
+            # Todas las estadísticas y los totales de una vez
+            resumen = obtener_estadisticas_todos()
+            accion.marcar("calcular estadísticas")
+            return resumen
         
-        if not historial:
-            tk.Label(
-                self.right_panel,
-                text="No hay datos aún...",
-                font=('Arial', 14),
-                bg='#1a1a2e',
-                fg='#888'
-            ).pack(expand=True)
-            return
+        def pintar(resumen):
+            accion.marcar("esperar al hilo de la UI")
+            self._pintar_resumen_general(*resumen)
+            accion.marcar("actualizar tabla")
+            accion.terminar()
+        
+        self._en_segundo_plano('panel', tarea, pintar)
+    
+    def _crear_resumen(self):
+        """Crea una sola vez la tabla (Treeview) y las tarjetas del resumen general"""
+        self.resumen_frame = tk.Frame(self.right_panel, bg='#1a1a2e')
         
         # Header
         tk.Label(
-            self.right_panel,
+            self.resumen_frame,
             text="📊 Resumen General - Todos los Perfiles",
             font=('Arial', 18, 'bold'),
             bg='#1a1a2e',
             fg='white'
         ).pack(pady=(0, 20))
         
+        # Estilo oscuro para la tabla
+        estilo = ttk.Style(self.root)
+        estilo.configure(
+            'Resumen.Treeview',
+            background='#1a1a2e', fieldbackground='#1a1a2e', foreground='white',
+            font=('Arial', 10), rowheight=30, borderwidth=0
+        )
+        estilo.configure(
+            'Resumen.Treeview.Heading',
+            background='#16213e', foreground='white', font=('Arial', 11, 'bold')
+        )
+        estilo.map('Resumen.Treeview', background=[('selected', '#e94560')])
+        
         # Tabla de resumen
-        tabla_frame = tk.Frame(self.right_panel, bg='#0f3460')
-        tabla_frame.pack(fill=tk.X, padx=10)
+        tabla_frame = tk.Frame(self.resumen_frame, bg='#0f3460')
+        tabla_frame.pack(fill=tk.BOTH, expand=True, padx=10)
         
-        # Encabezados
-        headers = ['Email', 'Puntos', 'Hoy', 'Mes', 'Promedio']
-        for i, h in enumerate(headers):
-            tk.Label(
-                tabla_frame,
-                text=h,
-                font=('Arial', 11, 'bold'),
-                bg='#16213e',
-                fg='white',
-                padx=15,
-                pady=10
-            ).grid(row=0, column=i, sticky='nsew')
-        
-        # Datos
-        total_puntos = 0
-        total_hoy = 0
-        total_mes = 0
-        
-        for row, (perfil, datos) in enumerate(historial.items(), start=1):
-            email = datos.get('email', 'Sin email')
-            stats = obtener_estadisticas(perfil)
-            
-            if stats:
-                valores = [
-                    email[:25] + '...' if len(email) > 25 else email,
-                    f"{stats['puntos_actuales']:,}",
-                    f"+{stats['ganancia_hoy']:,}",
-                    f"+{stats['ganancia_mes']:,}",
-                    f"~{stats['promedio_diario']:,}/día"
-                ]
-                total_puntos += stats['puntos_actuales']
-                total_hoy += stats['ganancia_hoy']
-                total_mes += stats['ganancia_mes']
-            else:
-                valores = [email[:25], '---', '---', '---', '---']
-            
-            for col, val in enumerate(valores):
-                color = '#27ae60' if col in [2, 3] and '+' in str(val) else 'white'
-                tk.Label(
-                    tabla_frame,
-                    text=val,
-                    font=('Arial', 10),
-                    bg='#0f3460' if row % 2 == 0 else '#1a1a2e',
-                    fg=color,
-                    padx=15,
-                    pady=8
-                ).grid(row=row, column=col, sticky='nsew')
-        
-        # Configurar columnas
-        for i in range(5):
-            tabla_frame.grid_columnconfigure(i, weight=1)
+        columnas = ['Email', 'Puntos', 'Hoy', 'Mes', 'Promedio']
+        self.tabla_resumen = ttk.Treeview(
+            tabla_frame, columns=columnas, show='headings', style='Resumen.Treeview'
+        )
+        for col in columnas:
+            self.tabla_resumen.heading(col, text=col, command=lambda c=col: self._ordenar_resumen(c))
+            self.tabla_resumen.column(col, anchor=tk.W if col == 'Email' else tk.CENTER, width=120)
+        self.tabla_resumen.tag_configure('par', background='#0f3460')
+        self.tabla_resumen.tag_configure('impar', background='#1a1a2e')
+        # Un Treeview no colorea celdas sueltas: la fila entera en verde si ganó puntos
+        self.tabla_resumen.tag_configure('ganancia', foreground='#27ae60')
+        
+        scrollbar = ttk.Scrollbar(tabla_frame, orient=tk.VERTICAL, command=self.tabla_resumen.yview)
+        self.tabla_resumen.configure(yscrollcommand=scrollbar.set)
+        self.tabla_resumen.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Valores numéricos de cada fila para ordenar sin volver a parsear el texto
+        self._claves_resumen = {}
+        self._orden_resumen = None
         
         # Totales
-        totales_frame = tk.Frame(self.right_panel, bg='#1a1a2e')
+        totales_frame = tk.Frame(self.resumen_frame, bg='#1a1a2e')
         totales_frame.pack(fill=tk.X, pady=20, padx=10)
         
         # Grid de totales
@@ -707,21 +822,110 @@ class DashboardWindow:
         
         card1 = self._crear_stat_card(
             totales_frame, "TOTAL Puntos (todos)", 
-            f"{total_puntos:,}", '#2980b9', '💎'
+            "0", '#2980b9', '💎'
         )
         card1.grid(row=0, column=0, padx=5, pady=5, sticky='nsew')
         
         card2 = self._crear_stat_card(
             totales_frame, "TOTAL Ganancia Hoy", 
-            f"+{total_hoy:,}", '#27ae60', '📈'
+            "+0", '#27ae60', '📈'
         )
         card2.grid(row=0, column=1, padx=5, pady=5, sticky='nsew')
         
         card3 = self._crear_stat_card(
             totales_frame, "TOTAL Ganancia Mes", 
-            f"+{total_mes:,}", '#8e44ad', '📅'
+            "+0", '#8e44ad', '📅'
         )
         card3.grid(row=0, column=2, padx=5, pady=5, sticky='nsew')
+        
+        self._totales_resumen = (card1.valor_label, card2.valor_label, card3.valor_label)
+    
+    def _pintar_resumen_general(self, filas, totales):
+        """Actualiza la tabla de resumen tocando solo las celdas que cambiaron"""
+        if not filas:
+            self._mostrar_mensaje("No hay datos aún...")
+            return
+        
+        self._limpiar_panel(expandir=False)
+        if not hasattr(self, 'tabla_resumen'):
+            self._crear_resumen()
+        self.resumen_frame.pack(fill=tk.BOTH, expand=True)
+        
+        tabla = self.tabla_resumen
+        
+        vistos = set()
+        for perfil, email, stats in filas:
+            if stats:
+                valores = (
+                    email[:25] + '...' if len(email) > 25 else email,
+                    f"{stats['puntos_actuales']:,}",
+                    f"+{stats['ganancia_hoy']:,}",
+                    f"+{stats['ganancia_mes']:,}",
+                    f"~{stats['promedio_diario']:,}/día"
+                )
+                claves = (email or '', stats['puntos_actuales'], stats['ganancia_hoy'],
+                          stats['ganancia_mes'], stats['promedio_diario'])
+            else:
+                valores = (email[:25], '---', '---', '---', '---')
+                claves = (email or '', -1, -1, -1, -1)
+            
+            vistos.add(perfil)
+            self._claves_resumen[perfil] = claves
+            if not tabla.exists(perfil):
+                tabla.insert('', tk.END, iid=perfil, values=valores)
+            elif tuple(tabla.set(perfil, col) for col in tabla['columns']) != valores:
+                # Solo se reescriben las celdas que cambiaron
+                for col, valor in zip(tabla['columns'], valores):
+                    if tabla.set(perfil, col) != valor:
+                        tabla.set(perfil, col, valor)
+        
+        # Quitar perfiles que ya no están en el historial
+        for perfil in tabla.get_children():
+            if perfil not in vistos:
+                tabla.delete(perfil)
+                self._claves_resumen.pop(perfil, None)
+        
+        if self._orden_resumen:
+            self._ordenar_resumen(*self._orden_resumen, alternar=False)
+        else:
+            self._colorear_filas_resumen()
+        
+        for label, texto in zip(self._totales_resumen,
+                                (f"{totales['puntos_actuales']:,}", f"+{totales['ganancia_hoy']:,}",
+                                 f"+{totales['ganancia_mes']:,}")):
+            if label.cget('text') != texto:
+                label.config(text=texto)
+    
+    def _ordenar_resumen(self, columna, descendente=None, alternar=True):
+        """Ordena la tabla de resumen moviendo las filas existentes"""
+        tabla = self.tabla_resumen
+        if alternar:
+            # Un segundo clic sobre la misma columna invierte el orden
+            anterior = self._orden_resumen
+            descendente = bool(anterior and anterior[0] == columna and not anterior[1])
+        self._orden_resumen = (columna, descendente)
+        
+        indice = list(tabla['columns']).index(columna)
+        filas = sorted(
+            tabla.get_children(),
+            key=lambda iid: self._claves_resumen[iid][indice],
+            reverse=descendente
+        )
+        for posicion, iid in enumerate(filas):
+            if tabla.index(iid) != posicion:
+                tabla.move(iid, '', posicion)
+        
+        self._colorear_filas_resumen()
+    
+    def _colorear_filas_resumen(self):
+        """Alterna el color de fondo de las filas y marca en verde las que ganaron puntos hoy o este mes"""
+        for posicion, iid in enumerate(self.tabla_resumen.get_children()):
+            tags = ('par' if posicion % 2 else 'impar',)
+            _, _, hoy, mes, _ = self._claves_resumen[iid]
+            if hoy > 0 or mes > 0:
+                tags += ('ganancia',)
+            if self.tabla_resumen.item(iid, 'tags') != tags:
+                self.tabla_resumen.item(iid, tags=tags)
     
     def run(self):
         """Inicia la ventana"""
@@ -738,6 +942,38 @@ def abrir_dashboard(parent=None):
 
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Dashboard de puntos de Microsoft Rewards")
+    parser.add_argument('--compactar', action='store_true',
+                        help="compactar el historial de puntos y salir")
+    parser.add_argument('--dias', type=int, default=None,
+                        help="días recientes que se conservan completos al compactar")
+    parser.add_argument('--reporte', nargs='?', const='', default=None, metavar='DIR',
+                        help="generar el reporte PNG/HTML en DIR sin abrir ventanas y salir")
+    parser.add_argument('--forzar', action='store_true',
+                        help="con --reporte, volver a dibujar todos los perfiles")
+    parser.add_argument('--perfilar', action='store_true',
+                        help="medir cada paso de las acciones (panel y perfilado_ui.jsonl)")
+    args = parser.parse_args()
+    
+    if args.perfilar:
+        instrumentacion.activar()
+    
+    if args.compactar:
+        import compactacion_historial
+        
+        dias = args.dias if args.dias is not None else compactacion_historial.DIAS_RESOLUCION_COMPLETA
+        compactacion_historial.imprimir_informe(compactacion_historial.compactar_historial(dias))
+        raise SystemExit(0)
+    
+    if args.reporte is not None:
+        import reporte_puntos
+        
+        directorio = args.reporte or reporte_puntos.REPORTE_DIR
+        reporte_puntos.imprimir_informe(reporte_puntos.generar_reporte(directorio, forzar=args.forzar))
+        raise SystemExit(0)
+    
     if not MATPLOTLIB_DISPONIBLE:
         print("⚠️ Para gráficas completas, instala matplotlib:")
         print("   pip install matplotlib")
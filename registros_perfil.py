@@ -0,0 +1,113 @@
+"""
+Registros de un perfil en formato compacto
+En lugar de un dict por registro ('fecha', 'hora' y 'puntos', con la fecha
+repetida dentro de la hora) se guardan dos columnas array de enteros de 64
+bits: la hora en segundos desde 1970-01-01 (hora local, sin zona) y los
+puntos. Ocupan 16 bytes por registro frente a varios cientos de un dict, y
+NumPy puede leerlas sin copiar ni parsear fechas.
+Los registros siguen pudiendo consultarse como dicts, que se crean al vuelo.
+"""
+
+from array import array
+from datetime import datetime, timedelta
+
+EPOCA = datetime(1970, 1, 1)
+SEGUNDO = timedelta(seconds=1)
+
+
+def hora_a_segundos(hora):
+    """Convierte 'YYYY-MM-DD HH:MM:SS' en segundos desde EPOCA"""
+    return (datetime.fromisoformat(hora) - EPOCA) // SEGUNDO
+
+
+def segundos_a_hora(segundos):
+    """Convierte segundos desde EPOCA en 'YYYY-MM-DD HH:MM:SS'"""
+    return (EPOCA + timedelta(seconds=segundos)).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class RegistrosPerfil:
+    """
+    Lista de registros de un perfil guardada por columnas.
+    Se comporta como una lista de solo lectura de dicts
+    {'fecha', 'hora', 'puntos'[, 'agrupados']}: admite len(), índices
+    (también negativos y slices) e iteración.
+    """
+
+    __slots__ = ('horas', 'puntos', 'agrupados')
+
+    def __init__(self, registros=None):
+        """
+        Args:
+            registros: Registros (dicts) iniciales (opcional)
+        """
+        self.horas = array('q')
+        self.puntos = array('q')
+        # Solo los registros compactados (ver compactacion_historial): índice -> cantidad
+        self.agrupados = {}
+
+        for registro in registros or []:
+            self.agregar(registro)
+
+    def agregar(self, registro):
+        """Añade un registro (dict con 'hora' y 'puntos') al final"""
+        cantidad = registro.get('agrupados', 1)
+        if cantidad > 1:
+            self.agrupados[len(self.horas)] = cantidad
+        self.horas.append(hora_a_segundos(registro['hora']))
+        self.puntos.append(registro['puntos'])
+
+    def desordenado(self):
+        """Indica si el último registro es anterior al penúltimo"""
+        return len(self.horas) > 1 and self.horas[-1] < self.horas[-2]
+
+    def ordenar(self):
+        """Ordena los registros por hora (sin alterar el orden de los empates)"""
+        orden = sorted(range(len(self.horas)), key=self.horas.__getitem__)
+        self.horas = array('q', [self.horas[i] for i in orden])
+        self.puntos = array('q', [self.puntos[i] for i in orden])
+        if self.agrupados:
+            nueva_posicion = {anterior: nuevo for nuevo, anterior in enumerate(orden)}
+            self.agrupados = {nueva_posicion[i]: n for i, n in self.agrupados.items()}
+
+    def iterar(self):
+        """Recorre los registros como tuplas (fecha, puntos, cantidad) sin crear dicts"""
+        fechas = {}
+        for i, (segundos, puntos) in enumerate(zip(self.horas, self.puntos)):
+            dia = segundos // 86400
+            fecha = fechas.get(dia)
+            if fecha is None:
+                fecha = fechas[dia] = (EPOCA + timedelta(days=dia)).strftime('%Y-%m-%d')
+            yield fecha, puntos, self.agrupados.get(i, 1)
+
+    def cantidad(self, indice):
+        """Número de registros originales que representa el registro indice"""
+        return self.agrupados.get(indice, 1)
+
+    def registro(self, indice):
+        """Devuelve el registro indice como dict"""
+        hora = segundos_a_hora(self.horas[indice])
+        registro = {'fecha': hora[:10], 'hora': hora, 'puntos': self.puntos[indice]}
+        cantidad = self.agrupados.get(indice)
+        if cantidad:
+            registro['agrupados'] = cantidad
+        return registro
+
+    def como_dicts(self):
+        """Devuelve todos los registros como una lista de dicts"""
+        return [self.registro(i) for i in range(len(self.horas))]
+
+    def __len__(self):
+        return len(self.horas)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self.registro(i) for i in range(*indice.indices(len(self.horas)))]
+        if indice < 0:
+            indice += len(self.horas)
+        if not 0 <= indice < len(self.horas):
+            raise IndexError('índice de registro fuera de rango')
+        return self.registro(indice)
+
+    def __iter__(self):
+        for i in range(len(self.horas)):
+            yield self.registro(i)
@@ -0,0 +1,263 @@
+"""
+Reporte de puntos sin interfaz gráfica
+Dibuja con el backend Agg de matplotlib (sin Tk) las gráficas de cada perfil
+en PNG y genera un index.html con la tabla de resumen y las gráficas.
+
+Cada gráfica se guarda junto con una clave calculada a partir del último
+registro del perfil y de la fecha del día (la ventana de las gráficas se
+desplaza cada día). En la siguiente ejecución solo se vuelven a dibujar los
+perfiles cuya clave cambió; del resto se reutilizan la imagen y las
+estadísticas guardadas en el manifiesto, sin leer su historial.
+"""
+
+import hashlib
+import html
+import json
+import os
+import re
+from datetime import datetime
+
+import puntos_dashboard
+from analitica_puntos import media_movil
+
+REPORTE_DIR = "reporte_puntos"
+MANIFIESTO_FILE = "manifiesto.json"
+INDICE_FILE = "index.html"
+
+# Cambiar al modificar cómo se dibujan las gráficas para invalidar la caché
+VERSION_REPORTE = 2
+
+
+def _clave_perfil(perfil_nombre, email, ultimo, hoy):
+    """Hash del último registro de un perfil (más la fecha y la versión del reporte)"""
+    datos = json.dumps([VERSION_REPORTE, hoy, perfil_nombre, email, ultimo], sort_keys=True)
+    return hashlib.sha256(datos.encode('utf-8')).hexdigest()[:16]
+
+
+def _nombre_archivo(perfil_nombre):
+    """Nombre de archivo PNG seguro para un perfil (con un hash corto del nombre
+    para que, p. ej., 'Profile 1' y 'Profile_1' no compartan imagen)"""
+    sufijo = hashlib.sha256(perfil_nombre.encode('utf-8')).hexdigest()[:8]
+    return re.sub(r'[^\w-]+', '_', perfil_nombre) + f'_{sufijo}.png'
+
+
+def _cargar_manifiesto(directorio):
+    """Lee el manifiesto del reporte anterior ({perfil: {'clave', 'archivo', 'email', 'stats'}})"""
+    ruta = os.path.join(directorio, MANIFIESTO_FILE)
+    if not os.path.exists(ruta):
+        return {}
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _guardar_manifiesto(directorio, manifiesto):
+    """Escribe el manifiesto (archivo temporal + renombrado)"""
+    ruta = os.path.join(directorio, MANIFIESTO_FILE)
+    with open(ruta + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, indent=2, ensure_ascii=False)
+    os.replace(ruta + '.tmp', ruta)
+
+
+def _borrar_imagen(directorio, archivo):
+    """Elimina una imagen del reporte si existe"""
+    if archivo:
+        ruta = os.path.join(directorio, archivo)
+        if os.path.exists(ruta):
+            os.remove(ruta)
+
+
+def _dibujar_perfil(fig, perfil_nombre, ruta):
+    """Dibuja las gráficas de evolución y ganancia diaria de un perfil en un PNG"""
+    import matplotlib.dates as mdates
+
+    fig.clf()
+
+    # Gráfica 1: Evolución de puntos
+    ax1 = fig.add_subplot(121)
+    puntos_dashboard.estilizar_ejes(ax1, 'Evolución de Puntos')
+    ax1.xaxis.set_major_locator(mdates.DayLocator(interval=5))
+    fechas, puntos = puntos_dashboard.obtener_datos_grafica(perfil_nombre, dias=30)
+    if fechas and puntos:
+        x = mdates.date2num(fechas)
+        ax1.plot(x, puntos, color='#e94560', linewidth=2, marker='o', markersize=4)
+        ax1.fill_between(x, puntos, alpha=0.3, color='#e94560')
+
+    # Gráfica 2: Ganancia diaria con su media móvil de 7 días
+    ax2 = fig.add_subplot(122)
+    puntos_dashboard.estilizar_ejes(ax2, 'Ganancia Diaria')
+    ax2.xaxis.set_major_locator(mdates.DayLocator(interval=2))
+    fechas_g, ganancias = puntos_dashboard.obtener_ganancia_diaria(perfil_nombre, dias=14)
+    if fechas_g and ganancias:
+        x_g = mdates.date2num(fechas_g)
+        colores = ['#27ae60' if g > 0 else '#e74c3c' for g in ganancias]
+        ax2.bar(x_g, ganancias, color=colores, alpha=0.8)
+        ax2.plot(x_g, media_movil(ganancias, 7), color='#f39c12', linewidth=1.5, linestyle='--')
+
+    fig.tight_layout(pad=2.0)
+    fig.savefig(ruta, facecolor=fig.get_facecolor())
+
+
+def _escribir_html(directorio, manifiesto, orden):
+    """Genera index.html con la tabla de resumen y las gráficas de cada perfil"""
+    totales = dict.fromkeys(puntos_dashboard.CLAVES_TOTALES, 0)
+    filas = []
+    secciones = []
+
+    for perfil_nombre in orden:
+        entrada = manifiesto[perfil_nombre]
+        stats = entrada['stats']
+        email = html.escape(entrada['email'] or 'Sin email')
+        if stats:
+            for clave in totales:
+                totales[clave] += stats[clave]
+            filas.append(
+                f"<tr><td>{html.escape(perfil_nombre)}</td><td>{email}</td>"
+                f"<td>{stats['puntos_actuales']:,}</td><td>+{stats['ganancia_hoy']:,}</td>"
+                f"<td>+{stats['ganancia_mes']:,}</td><td>~{stats['promedio_diario']:,}/día</td></tr>"
+            )
+        else:
+            filas.append(
+                f"<tr><td>{html.escape(perfil_nombre)}</td><td>{email}</td>"
+                "<td>---</td><td>---</td><td>---</td><td>---</td></tr>"
+            )
+        if entrada.get('archivo'):
+            secciones.append(
+                f"<h2>{email} <small>({html.escape(perfil_nombre)})</small></h2>"
+                f"<img src=\"{html.escape(entrada['archivo'])}\" alt=\"{email}\">"
+            )
+
+    contenido = f"""<!DOCTYPE html>
+<html lang="es">
+<head>
+<meta charset="utf-8">
+<title>Reporte de Puntos - Microsoft Rewards</title>
+<style>
+body {{ background: #1a1a2e; color: white; font-family: Arial, sans-serif; margin: 30px; }}
+table {{ border-collapse: collapse; margin-bottom: 30px; }}
+th, td {{ padding: 8px 16px; text-align: left; }}
+th {{ background: #16213e; }}
+tr:nth-child(even) td {{ background: #0f3460; }}
+small {{ color: #888; }}
+img {{ max-width: 100%; }}
+</style>
+</head>
+<body>
+<h1>📊 Resumen General - Todos los Perfiles</h1>
+<p><small>Generado: {datetime.now().strftime('%d/%m/%Y %H:%M')}</small></p>
+<table>
+<tr><th>Perfil</th><th>Email</th><th>Puntos</th><th>Hoy</th><th>Mes</th><th>Promedio</th></tr>
+{chr(10).join(filas)}
+<tr><th colspan="2">Total</th><th>{totales['puntos_actuales']:,}</th>
+<th>+{totales['ganancia_hoy']:,}</th><th>+{totales['ganancia_mes']:,}</th><th></th></tr>
+</table>
+{chr(10).join(secciones)}
+</body>
+</html>
+"""
+    ruta = os.path.join(directorio, INDICE_FILE)
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write(contenido)
+    return ruta
+
+
+def generar_reporte(directorio=REPORTE_DIR, forzar=False):
+    """
+    Genera (o actualiza) el reporte en un directorio
+
+    Args:
+        directorio: Carpeta donde se guardan los PNG, el manifiesto e index.html
+        forzar: Si True, vuelve a dibujar todos los perfiles aunque no hayan cambiado
+
+    Returns:
+        dict {'dibujados', 'reutilizados', 'eliminados', 'errores', 'html'} o None
+        si falta matplotlib
+    """
+    if not puntos_dashboard.MATPLOTLIB_DISPONIBLE:
+        return None
+
+    # Solo Agg: no se importa pyplot ni Tk
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    os.makedirs(directorio, exist_ok=True)
+    hoy = datetime.now().strftime('%Y-%m-%d')
+    anterior = _cargar_manifiesto(directorio)
+
+    # Último registro de cada perfil (del índice, sin leer todo el historial)
+    ultimos = puntos_dashboard.cargar_ultimos_registros()
+
+    manifiesto = {}
+    informe = {'dibujados': 0, 'reutilizados': 0, 'eliminados': 0, 'errores': 0}
+    fig = None
+
+    for perfil_nombre, datos in ultimos.items():
+        clave = _clave_perfil(perfil_nombre, datos['email'], datos['ultimo'], hoy)
+        entrada = anterior.get(perfil_nombre)
+        if (not forzar and entrada and entrada['clave'] == clave
+                and os.path.exists(os.path.join(directorio, entrada['archivo']))):
+            manifiesto[perfil_nombre] = entrada
+            informe['reutilizados'] += 1
+            continue
+
+        if fig is None:
+            fig = Figure(figsize=(10, 5), dpi=100, facecolor='#1a1a2e')
+            FigureCanvasAgg(fig)
+
+        archivo = _nombre_archivo(perfil_nombre)
+        try:
+            _dibujar_perfil(fig, perfil_nombre, os.path.join(directorio, archivo))
+        except Exception as e:
+            print(f"Error al dibujar {perfil_nombre}: {e}")
+            informe['errores'] += 1
+            # Conservar la imagen anterior; sin ella, el perfil sigue en la tabla
+            # sin gráfica y con clave vacía para volver a intentarlo la próxima vez
+            manifiesto[perfil_nombre] = entrada or {
+                'clave': None,
+                'archivo': None,
+                'email': datos['email'],
+                'stats': puntos_dashboard.obtener_estadisticas(perfil_nombre)
+            }
+            continue
+
+        # Imagen con otro nombre de una versión anterior del reporte
+        if entrada and entrada.get('archivo') and entrada['archivo'] != archivo:
+            _borrar_imagen(directorio, entrada['archivo'])
+
+        manifiesto[perfil_nombre] = {
+            'clave': clave,
+            'archivo': archivo,
+            'email': datos['email'],
+            'stats': puntos_dashboard.obtener_estadisticas(perfil_nombre)
+        }
+        informe['dibujados'] += 1
+
+    # Borrar las imágenes de perfiles que ya no están en el historial
+    for perfil_nombre, entrada in anterior.items():
+        if perfil_nombre not in ultimos:
+            _borrar_imagen(directorio, entrada.get('archivo'))
+            informe['eliminados'] += 1
+
+    ruta_html = os.path.join(directorio, INDICE_FILE)
+    if (informe['dibujados'] or informe['eliminados'] or informe['errores']
+            or not os.path.exists(ruta_html)):
+        ruta_html = _escribir_html(directorio, manifiesto, list(manifiesto))
+        _guardar_manifiesto(directorio, manifiesto)
+
+    informe['html'] = ruta_html
+    return informe
+
+
+def imprimir_informe(informe):
+    """Muestra por consola el resultado de generar_reporte"""
+    if informe is None:
+        print("⚠️ Para generar el reporte instala matplotlib: pip install matplotlib")
+        return
+
+    print(f"🖼️ Reporte: {informe['dibujados']} perfiles dibujados, "
+          f"{informe['reutilizados']} reutilizados de la caché"
+          + (f", {informe['eliminados']} eliminados" if informe['eliminados'] else "")
+          + (f", {informe['errores']} con errores" if informe['errores'] else ""))
+    print(f"   • {os.path.abspath(informe['html'])}")
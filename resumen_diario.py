@@ -0,0 +1,277 @@
+"""
+Resumen diario de puntos por perfil
+Guarda en SQLite el último, mínimo y máximo de puntos de cada día, para que
+las gráficas lean unas pocas filas ya agregadas en lugar de recorrer todo el
+historial. Se mantiene al día leyendo solo las líneas nuevas del historial.
+
+En la misma base de datos se guarda un índice con la posición (en bytes) de
+cada registro dentro del historial, para poder leer un solo perfil o sus
+últimos registros sin recorrer el archivo entero.
+"""
+
+import os
+import sqlite3
+import threading
+
+import analitica_puntos
+import historial_store
+
+RESUMEN_DB = "historial_puntos.db"
+
+# Filas del índice que se insertan de una vez al reconstruirlo
+LOTE_INDICE = 10000
+
+_lock = threading.Lock()
+
+
+def _conectar():
+    """Abre la base de datos y crea las tablas si no existen"""
+    conexion = sqlite3.connect(RESUMEN_DB, timeout=10)
+    conexion.execute("PRAGMA journal_mode=WAL")
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS resumen_diario (
+            perfil TEXT NOT NULL,
+            fecha TEXT NOT NULL,
+            ultimo INTEGER NOT NULL,
+            minimo INTEGER NOT NULL,
+            maximo INTEGER NOT NULL,
+            registros INTEGER NOT NULL,
+            PRIMARY KEY (perfil, fecha)
+        ) WITHOUT ROWID
+    """)
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS indice_registros (
+            perfil TEXT NOT NULL,
+            posicion INTEGER NOT NULL,
+            PRIMARY KEY (perfil, posicion)
+        ) WITHOUT ROWID
+    """)
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS perfiles (
+            perfil TEXT PRIMARY KEY,
+            email TEXT,
+            primera_posicion INTEGER NOT NULL,
+            ultima_posicion INTEGER NOT NULL
+        )
+    """)
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS meta (
+            clave TEXT PRIMARY KEY,
+            valor INTEGER
+        )
+    """)
+    return conexion
+
+
+def _leer_meta(conexion, clave):
+    fila = conexion.execute("SELECT valor FROM meta WHERE clave = ?", (clave,)).fetchone()
+    return fila[0] if fila else None
+
+
+def _guardar_meta(conexion, clave, valor):
+    conexion.execute(
+        "INSERT INTO meta (clave, valor) VALUES (?, ?) "
+        "ON CONFLICT(clave) DO UPDATE SET valor = excluded.valor",
+        (clave, valor)
+    )
+
+
+def _reconstruir(conexion, por_perfil):
+    """Llena el resumen desde cero agrupando por día todo el historial"""
+    conexion.execute("DELETE FROM resumen_diario")
+    for perfil, registros_perfil in por_perfil.items():
+        conexion.executemany(
+            "INSERT INTO resumen_diario (perfil, fecha, ultimo, minimo, maximo, registros) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(perfil, *fila) for fila in analitica_puntos.resumen_por_dia(registros_perfil)]
+        )
+
+
+def _sincronizar(conexion):
+    """Incorpora al resumen los registros añadidos al historial desde la última vez"""
+    historial_store.migrar_historial_legado()
+    try:
+        st = os.stat(historial_store.HISTORIAL_JSONL)
+        inode, tamano = st.st_ino, st.st_size
+    except OSError:
+        inode, tamano = None, 0
+
+    offset = _leer_meta(conexion, 'offset') or 0
+    if inode == _leer_meta(conexion, 'inode') and tamano == offset:
+        return
+
+    with conexion:
+        # Si el historial se reescribió (migración, compactación) se reconstruye
+        if inode != _leer_meta(conexion, 'inode') or tamano < offset:
+            offset = 0
+
+        reconstruir = offset == 0
+        if reconstruir:
+            conexion.execute("DELETE FROM indice_registros")
+            conexion.execute("DELETE FROM perfiles")
+
+        # Al reconstruir, los registros se agrupan por perfil; si no, se
+        # incorporan uno a uno
+        por_perfil = {}
+        registros = []
+        indice = []
+        perfiles = {}
+
+        def al_leer(posicion, r):
+            perfil = r.pop('perfil')
+            email = r.pop('email', None)
+            if reconstruir:
+                por_perfil.setdefault(perfil, []).append(r)
+            else:
+                registros.append((perfil, r))
+            indice.append((perfil, posicion))
+            if len(indice) >= LOTE_INDICE:
+                _guardar_indice(conexion, indice)
+            if perfil in perfiles:
+                perfiles[perfil][1:] = [email or perfiles[perfil][1], posicion]
+            else:
+                perfiles[perfil] = [posicion, email, posicion]
+
+        offset = historial_store.recorrer_lineas_desde(offset, al_leer)
+        _guardar_indice(conexion, indice)
+        conexion.executemany(
+            """
+            INSERT INTO perfiles (perfil, email, primera_posicion, ultima_posicion)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(perfil) DO UPDATE SET
+                email = COALESCE(excluded.email, perfiles.email),
+                ultima_posicion = excluded.ultima_posicion
+            """,
+            [(perfil, email, primera, ultima) for perfil, (primera, email, ultima) in perfiles.items()]
+        )
+
+        if reconstruir:
+            _reconstruir(conexion, por_perfil)
+
+        conexion.executemany(
+            """
+            INSERT INTO resumen_diario (perfil, fecha, ultimo, minimo, maximo, registros)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(perfil, fecha) DO UPDATE SET
+                ultimo = excluded.ultimo,
+                minimo = MIN(minimo, excluded.minimo),
+                maximo = MAX(maximo, excluded.maximo),
+                registros = registros + excluded.registros
+            """,
+            [(perfil, r['fecha'], r['puntos'], r['puntos'], r['puntos'], r.get('agrupados', 1))
+             for perfil, r in registros]
+        )
+        _guardar_meta(conexion, 'offset', offset)
+        _guardar_meta(conexion, 'inode', inode)
+
+
+def _guardar_indice(conexion, indice):
+    """Inserta en el índice las posiciones pendientes y vacía la lista"""
+    conexion.executemany(
+        "INSERT OR REPLACE INTO indice_registros (perfil, posicion) VALUES (?, ?)", indice
+    )
+    indice.clear()
+
+
+def sincronizar():
+    """Pone al día el resumen con lo último escrito en el historial"""
+    with _lock:
+        conexion = _conectar()
+        try:
+            _sincronizar(conexion)
+        finally:
+            conexion.close()
+
+
+def consultar(perfil_nombre, desde=None, hasta=None):
+    """
+    Consulta el resumen diario de un perfil en un rango de fechas (inclusive)
+
+    Args:
+        perfil_nombre: Nombre del perfil
+        desde: Fecha 'YYYY-MM-DD' inicial o None
+        hasta: Fecha 'YYYY-MM-DD' final o None
+
+    Returns:
+        tuple (total_registros, [(fecha, ultimo, minimo, maximo), ...])
+        total_registros cuenta todo el historial del perfil, no solo el rango
+    """
+    with _lock:
+        conexion = _conectar()
+        try:
+            _sincronizar(conexion)
+
+            total = conexion.execute(
+                "SELECT COALESCE(SUM(registros), 0) FROM resumen_diario WHERE perfil = ?",
+                (perfil_nombre,)
+            ).fetchone()[0]
+
+            filas = conexion.execute(
+                """
+                SELECT fecha, ultimo, minimo, maximo FROM resumen_diario
+                WHERE perfil = ? AND fecha >= ? AND fecha <= ?
+                ORDER BY fecha
+                """,
+                (perfil_nombre, desde or '', hasta or '9999-12-31')
+            ).fetchall()
+        finally:
+            conexion.close()
+
+    return total, filas
+
+
+def consultar_posiciones(perfil_nombre, ultimos=None):
+    """
+    Posiciones (en bytes) de los registros de un perfil dentro del historial
+
+    Args:
+        perfil_nombre: Nombre del perfil
+        ultimos: Si se indica, solo las de los N últimos registros
+
+    Returns:
+        tuple (email, [posiciones en el orden en que se escribieron])
+        email es el último conocido del perfil (None si no lo tiene)
+    """
+    with _lock:
+        conexion = _conectar()
+        try:
+            _sincronizar(conexion)
+
+            fila = conexion.execute(
+                "SELECT email FROM perfiles WHERE perfil = ?", (perfil_nombre,)
+            ).fetchone()
+
+            if ultimos is None:
+                filas = conexion.execute(
+                    "SELECT posicion FROM indice_registros WHERE perfil = ? ORDER BY posicion",
+                    (perfil_nombre,)
+                ).fetchall()
+            else:
+                filas = conexion.execute(
+                    "SELECT posicion FROM indice_registros WHERE perfil = ? "
+                    "ORDER BY posicion DESC LIMIT ?",
+                    (perfil_nombre, ultimos)
+                ).fetchall()
+                filas.reverse()
+        finally:
+            conexion.close()
+
+    return (fila[0] if fila else None), [f[0] for f in filas]
+
+
+def consultar_perfiles():
+    """
+    Perfiles del historial en el orden en que aparecieron por primera vez
+
+    Returns:
+        list [(perfil, email, posición de su último registro), ...]
+    """
+    with _lock:
+        conexion = _conectar()
+        try:
+            _sincronizar(conexion)
+            return conexion.execute(
+                "SELECT perfil, email, ultima_posicion FROM perfiles ORDER BY primera_posicion"
+            ).fetchall()
+        finally:
+            conexion.close()
@@ -0,0 +1,165 @@
+"""
+Pruebas de AgregadorPerfil
+Comprueba que las estadísticas incrementales (ruta Python y ruta NumPy) dan
+los mismos números que el cálculo original de obtener_estadisticas, que se
+reproduce aquí tal cual como referencia.
+
+Uso: python -m pytest test_estadisticas_puntos.py  (o python -m unittest)
+"""
+
+import json
+import os
+import random
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+import analitica_puntos
+from estadisticas_puntos import AgregadorPerfil
+from registros_perfil import RegistrosPerfil
+
+HISTORIAL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "historial_puntos.json")
+
+# Momentos fijos para que las pruebas no dependan del reloj
+AHORAS = [
+    datetime(2026, 2, 4, 23, 0, 0),    # el mismo día de los registros
+    datetime(2026, 2, 8, 12, 0, 0),    # días después, dentro de la semana
+    datetime(2026, 2, 20, 12, 0, 0),   # fuera de la ventana de 7 días
+    datetime(2026, 3, 1, 12, 0, 0),    # otro mes
+]
+
+
+def estadisticas_referencia(registros, ahora):
+    """Algoritmo original de puntos_dashboard.obtener_estadisticas, con ahora fijo"""
+    registros_ordenados = sorted(registros, key=lambda x: x['hora'])
+    puntos_actuales = registros_ordenados[-1]['puntos']
+    primer_registro = registros_ordenados[0]
+    ganancia_neta_total = puntos_actuales - primer_registro['puntos']
+
+    hoy = ahora.strftime('%Y-%m-%d')
+    mes_actual = ahora.strftime('%Y-%m')
+
+    ganancia_bruta_hoy = gasto_hoy = 0
+    ganancia_bruta_mes = gasto_mes = 0
+    gasto_total = 0
+    UMBRAL_GASTO_MINIMO = 50
+
+    prev_r = registros_ordenados[0]
+    for r in registros_ordenados[1:]:
+        diff = r['puntos'] - prev_r['puntos']
+        es_hoy = (r['fecha'] == hoy)
+        es_mes = r['fecha'].startswith(mes_actual)
+        if diff > 0:
+            if es_hoy: ganancia_bruta_hoy += diff
+            if es_mes: ganancia_bruta_mes += diff
+        elif diff < -UMBRAL_GASTO_MINIMO:
+            gasto = abs(diff)
+            gasto_total += gasto
+            if es_hoy: gasto_hoy += gasto
+            if es_mes: gasto_mes += gasto
+        prev_r = r
+
+    hace_7_dias = (ahora - timedelta(days=7)).strftime('%Y-%m-%d')
+    registros_semana = [r for r in registros_ordenados if r['fecha'] >= hace_7_dias]
+
+    promedio_diario = 0
+    if len(registros_semana) >= 2:
+        dias = (ahora - datetime.strptime(registros_semana[0]['fecha'], '%Y-%m-%d')).days
+        if dias > 0:
+            promedio_diario = (registros_semana[-1]['puntos'] - registros_semana[0]['puntos']) / dias
+            if promedio_diario < 0: promedio_diario = 0
+
+    return {
+        'puntos_actuales': puntos_actuales,
+        'ganancia_hoy': ganancia_bruta_hoy,
+        'gasto_hoy': gasto_hoy,
+        'ganancia_mes': ganancia_bruta_mes,
+        'gasto_mes': gasto_mes,
+        'total_gastado': gasto_total,
+        'ganancia_total_neta': ganancia_neta_total,
+        'promedio_diario': int(promedio_diario),
+        'primer_registro': primer_registro['fecha'],
+        'total_registros': len(registros_ordenados)
+    }
+
+
+def historial_sintetico(n, fin, semilla=0):
+    """Registros de un perfil con ganancias, fluctuaciones y canjes hasta fin"""
+    rnd = random.Random(semilla)
+    hora = fin - timedelta(hours=3 * n)
+    puntos = 2000
+    registros = []
+    for _ in range(n):
+        hora += timedelta(hours=3, seconds=rnd.randint(-600, 600))
+        azar = rnd.random()
+        if azar < 0.03:
+            puntos = max(0, puntos - rnd.randint(100, 3000))
+        elif azar < 0.15:
+            puntos = max(0, puntos - rnd.randint(1, 60))
+        else:
+            puntos += rnd.randint(0, 40)
+        registros.append({
+            'fecha': hora.strftime('%Y-%m-%d'),
+            'hora': hora.strftime('%Y-%m-%d %H:%M:%S'),
+            'puntos': puntos
+        })
+    return registros
+
+
+class TestAgregadorPerfil(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with open(HISTORIAL_FILE, 'r', encoding='utf-8') as f:
+            cls.historial = json.load(f)
+
+    def comprobar(self, registros, ahoras=AHORAS):
+        ordenados = sorted(registros, key=lambda x: x['hora'])
+        for ahora in ahoras:
+            esperado = estadisticas_referencia(registros, ahora)
+            with self.subTest(ahora=ahora, entrada='lista'):
+                self.assertEqual(AgregadorPerfil(ordenados).estadisticas(ahora), esperado)
+            with self.subTest(ahora=ahora, entrada='RegistrosPerfil'):
+                self.assertEqual(AgregadorPerfil(RegistrosPerfil(ordenados)).estadisticas(ahora), esperado)
+
+    def test_historial_incluido(self):
+        for perfil_nombre, datos in self.historial.items():
+            with self.subTest(perfil=perfil_nombre):
+                self.comprobar(datos['registros'])
+
+    def test_historial_incluido_incremental(self):
+        for perfil_nombre, datos in self.historial.items():
+            ordenados = sorted(datos['registros'], key=lambda x: x['hora'])
+            agregador = AgregadorPerfil()
+            for registro in ordenados:
+                agregador.agregar(registro)
+            with self.subTest(perfil=perfil_nombre):
+                self.assertEqual(
+                    agregador.estadisticas(AHORAS[0]),
+                    estadisticas_referencia(ordenados, AHORAS[0])
+                )
+
+    def test_sin_registros(self):
+        self.assertIsNone(AgregadorPerfil([]).estadisticas(AHORAS[0]))
+
+    def test_historial_sintetico(self):
+        fin = datetime(2026, 2, 4, 20, 0, 0)
+        registros = historial_sintetico(2000, fin)
+        self.comprobar(registros, [fin + timedelta(hours=2), fin + timedelta(days=3)])
+
+
+@unittest.skipUnless(analitica_puntos.NUMPY_DISPONIBLE, "numpy no está instalado")
+class TestAgregadorPerfilNumpy(TestAgregadorPerfil):
+    """Las mismas pruebas forzando la ruta vectorizada también en historiales pequeños"""
+
+    def setUp(self):
+        parche = mock.patch.object(analitica_puntos, 'MINIMO_VECTORIZAR', 1)
+        parche.start()
+        self.addCleanup(parche.stop)
+
+    def test_usa_numpy(self):
+        self.assertTrue(analitica_puntos.usar_numpy([{}]))
+
+
+if __name__ == "__main__":
+    unittest.main()